@@ -3,15 +3,335 @@ Emil's Mesh Toolkit - Rigging Module
 Tools for working with armatures and rigging
 """
 
+import re
+import time
+
 import bpy
-from mathutils import Vector
-from .toolkit_common import ToolkitUtils, ToolkitOperator, ToolkitPanel
+import numpy as np
+from .toolkit_common import ToolkitUtils, ToolkitOperator, ToolkitPanel, ToolkitCache
+from . import toolkit_overlay
+from .mod_weights import (
+    WeightTable, get_armature_object, get_rig_binding, get_bone_segments,
+    get_armature_segments, segments_to_object, read_vertex_coords, to_world_coords,
+    write_weight_table, get_vertex_adjacency, neighbor_mean, dense_group_block,
+    get_deform_group_mask,
+)
+
+
+# ==================== DATA ====================
+
+def get_group_bone_indices(obj, armature, deform_only=False):
+    """Map every vertex group index to its armature bone index (-1 if none)
+
+    Read from obj's cached rig binding when armature is its bound armature.
+    """
+    binding = get_rig_binding(obj)
+    if binding.armature == armature:
+        return binding.deform_group_bones if deform_only else binding.group_bones
+    
+    bone_index = {
+        bone.name: i for i, bone in enumerate(armature.data.bones)
+        if bone.use_deform or not deform_only
+    }
+    return np.array(
+        [bone_index.get(vg.name, -1) for vg in obj.vertex_groups] or [-1],
+        dtype=np.int64,
+    )
+
+
+def top_bone_weights(table, group_bones, count):
+    """Each vertex's top `count` bones with weights normalized over them
+
+    Returns (vertex indices with at least one bone, (n, count) bone indices,
+    (n, count) blend factors); unused slots have factor 0.
+    """
+    bones = group_bones[table.groups]
+    table = table.select((bones >= 0) & (table.weights > 0))
+    groups, weights = table.top_k(count)
+    
+    totals = weights.sum(axis=1)
+    rows = np.nonzero(totals > 0)[0]
+    bones = np.where(groups[rows] >= 0, group_bones[np.maximum(groups[rows], 0)], 0)
+    return rows, bones, weights[rows] / totals[rows, None]
+
+
+def bone_target_points(target, heads, tails, bones, points):
+    """Per-slot target positions (n, k, 3) on the given bones for points (n, 3)"""
+    if target == "HEAD":
+        return heads[bones]
+    if target == "TAIL":
+        return tails[bones]
+    
+    # Closest point on each head-tail segment
+    h, t = heads[bones], tails[bones]
+    axis = t - h
+    length2 = np.einsum("nkj,nkj->nk", axis, axis)
+    proj = np.einsum("nkj,nkj->nk", points[:, None, :] - h, axis)
+    proj = np.clip(np.divide(proj, length2, out=np.zeros_like(proj), where=length2 > 0), 0.0, 1.0)
+    return h + proj[..., None] * axis
+
+
+def nearest_bone_segments(points, heads, tails, count, block_size=8192):
+    """The `count` nearest bone segments per point, nearest first
+
+    Distances to every segment are computed in blocks of points so memory stays at
+    block_size * num_bones. Returns ((n, count) bone indices, (n, count) distances).
+    """
+    count = min(count, len(heads))
+    axis = (tails - heads).astype(np.float32)
+    heads = heads.astype(np.float32)
+    length2 = np.einsum("bj,bj->b", axis, axis)
+    inv_length2 = np.divide(1.0, length2, out=np.zeros_like(length2), where=length2 > 0)
+    
+    bones = np.empty((len(points), count), dtype=np.int64)
+    distances = np.empty((len(points), count), dtype=np.float32)
+    for start in range(0, len(points), block_size):
+        rel = points[start:start + block_size, None, :].astype(np.float32) - heads
+        t = np.clip(np.einsum("nbj,bj->nb", rel, axis) * inv_length2, 0.0, 1.0)
+        rel -= t[..., None] * axis
+        dist = np.sqrt(np.einsum("nbj,nbj->nb", rel, rel))
+        
+        if count < dist.shape[1]:
+            nearest = np.argpartition(dist, count - 1, axis=1)[:, :count]
+        else:
+            nearest = np.broadcast_to(np.arange(count), dist.shape)
+        near_dist = np.take_along_axis(dist, nearest, axis=1)
+        order = np.argsort(near_dist, axis=1)
+        bones[start:start + block_size] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:start + block_size] = np.take_along_axis(near_dist, order, axis=1)
+    return bones, distances
+
+
+def falloff_weights(distances, power, epsilon=1.0e-4):
+    """Inverse-distance falloff weights per row, normalized to 1.0"""
+    weights = 1.0 / np.power(np.maximum(distances, epsilon), power)
+    return (weights / weights.sum(axis=1, keepdims=True)).astype(np.float32)
+
+
+# ==================== SKINNING ====================
+
+_POSE_PATH = re.compile(r'pose\.bones\["(.+)"\]\.(location|rotation_quaternion|rotation_euler|rotation_axis_angle|scale)$')
+
+
+def read_matrices(collection, attr):
+    """Bulk-read a 4x4 matrix property of every item as a (n, 4, 4) row-major array"""
+    flat = np.empty(len(collection) * 16, dtype=np.float32)
+    collection.foreach_get(attr, flat)
+    # foreach_get copies Blender's column-major storage
+    return flat.reshape(-1, 4, 4).transpose(0, 2, 1).astype(np.float64)
+
+
+def quaternion_matrices(q):
+    """(..., 4) wxyz quaternions to (..., 3, 3) rotation matrices"""
+    q = q / np.maximum(np.linalg.norm(q, axis=-1, keepdims=True), 1e-12)
+    w, x, y, z = np.moveaxis(q, -1, 0)
+    return np.stack((
+        np.stack((1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)), axis=-1),
+        np.stack((2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)), axis=-1),
+        np.stack((2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)), axis=-1),
+    ), axis=-2)
+
+
+def euler_matrices(e, order):
+    """(..., 3) euler angles to (..., 3, 3) rotation matrices (Blender order, e.g. 'XYZ')"""
+    c, s = np.cos(e), np.sin(e)
+    one, zero = np.ones_like(e[..., 0]), np.zeros_like(e[..., 0])
+    axes = {
+        "X": np.stack((np.stack((one, zero, zero), -1),
+                       np.stack((zero, c[..., 0], -s[..., 0]), -1),
+                       np.stack((zero, s[..., 0], c[..., 0]), -1)), -2),
+        "Y": np.stack((np.stack((c[..., 1], zero, s[..., 1]), -1),
+                       np.stack((zero, one, zero), -1),
+                       np.stack((-s[..., 1], zero, c[..., 1]), -1)), -2),
+        "Z": np.stack((np.stack((c[..., 2], -s[..., 2], zero), -1),
+                       np.stack((s[..., 2], c[..., 2], zero), -1),
+                       np.stack((zero, zero, one), -1)), -2),
+    }
+    return axes[order[2]] @ axes[order[1]] @ axes[order[0]]
+
+
+def collect_pose_matrices(armature, action, frames):
+    """Armature-space pose matrices (f, b, 4, 4) of every bone for each frame of action
+
+    Channels are evaluated from the action's F-curves (unkeyed channels keep the
+    current pose values) and composed down the bone hierarchy in NumPy. Constraints,
+    drivers and inherit flags are not evaluated. Rows follow armature.data.bones order.
+    """
+    bones = armature.data.bones
+    pose_bones = armature.pose.bones
+    frames = np.asarray(frames, dtype=np.float64)
+    num_frames, num_bones = len(frames), len(bones)
+    bone_index = {bone.name: i for i, bone in enumerate(bones)}
+    
+    channels = {
+        "location": np.array([pose_bones[b.name].location for b in bones], dtype=np.float64),
+        "rotation_quaternion": np.array([pose_bones[b.name].rotation_quaternion for b in bones], dtype=np.float64),
+        "rotation_euler": np.array([pose_bones[b.name].rotation_euler for b in bones], dtype=np.float64),
+        "rotation_axis_angle": np.array([pose_bones[b.name].rotation_axis_angle for b in bones], dtype=np.float64),
+        "scale": np.array([pose_bones[b.name].scale for b in bones], dtype=np.float64),
+    }
+    channels = {name: np.repeat(values[None], num_frames, axis=0) for name, values in channels.items()}
+    
+    if action:
+        for fcurve in action.fcurves:
+            match = _POSE_PATH.match(fcurve.data_path)
+            if not match or match.group(1) not in bone_index:
+                continue
+            values = channels[match.group(2)]
+            if fcurve.array_index < values.shape[2]:
+                values[:, bone_index[match.group(1)], fcurve.array_index] = [fcurve.evaluate(f) for f in frames.tolist()]
+    
+    # Local basis matrices: translation @ rotation @ scale
+    rotation = np.empty((num_frames, num_bones, 3, 3))
+    for i, bone in enumerate(bones):
+        mode = pose_bones[bone.name].rotation_mode
+        if mode == "QUATERNION":
+            rotation[:, i] = quaternion_matrices(channels["rotation_quaternion"][:, i])
+        elif mode == "AXIS_ANGLE":
+            angle, axis = channels["rotation_axis_angle"][:, i, 0], channels["rotation_axis_angle"][:, i, 1:]
+            axis = axis / np.maximum(np.linalg.norm(axis, axis=-1, keepdims=True), 1e-12)
+            quat = np.concatenate((np.cos(angle / 2)[:, None], np.sin(angle / 2)[:, None] * axis), axis=-1)
+            rotation[:, i] = quaternion_matrices(quat)
+        else:
+            rotation[:, i] = euler_matrices(channels["rotation_euler"][:, i], mode)
+    
+    basis = np.zeros((num_frames, num_bones, 4, 4))
+    basis[..., :3, :3] = rotation * channels["scale"][..., None, :]
+    basis[..., :3, 3] = channels["location"]
+    basis[..., 3, 3] = 1.0
+    
+    # Compose parents before children
+    rest = read_matrices(bones, "matrix_local")
+    poses = np.empty_like(basis)
+    for bone in sorted(bones, key=lambda b: len(b.parent_recursive)):
+        i = bone_index[bone.name]
+        if bone.parent:
+            parent = bone_index[bone.parent.name]
+            offset = np.linalg.inv(rest[parent]) @ rest[i]
+            poses[:, i] = poses[:, parent] @ offset @ basis[:, i]
+        else:
+            poses[:, i] = rest[i] @ basis[:, i]
+    return poses
+
+
+def get_skinning_matrices(obj, armature, poses):
+    """Object-space skinning matrices (f, b, 3, 4) mapping rest vertices of obj to each pose"""
+    rest_inverse = np.linalg.inv(read_matrices(armature.data.bones, "matrix_local"))
+    to_armature = np.array(armature.matrix_world.inverted() @ obj.matrix_world, dtype=np.float64)
+    from_armature = np.linalg.inv(to_armature)
+    skin = from_armature @ poses @ rest_inverse @ to_armature
+    return skin[..., :3, :].astype(np.float32)
+
+
+def get_skinning_weights(obj, armature, max_influences=None):
+    """Deform-bone influences as padded (n, k) bone indices and normalized weights"""
+    group_bones = get_group_bone_indices(obj, armature, deform_only=True)
+    table = WeightTable.from_mesh(obj.data)
+    table = table.select((group_bones[table.groups] >= 0) & (table.weights > 0))
+    
+    k = max_influences or max(int(table.counts().max()) if table.num_verts else 1, 1)
+    groups, weights = table.top_k(k)
+    bones = np.where(groups >= 0, group_bones[np.maximum(groups, 0)], 0)
+    
+    totals = weights.sum(axis=1, keepdims=True)
+    weights = np.divide(weights, totals, out=np.zeros_like(weights), where=totals > 0)
+    return bones, weights
+
+
+def lbs_positions(coords, bones, weights, skin, chunk_size=65536):
+    """Linear blend skinning of (n, 3) coords for one pose's (b, 3, 4) matrices
+
+    Vertices without influences keep their rest position. Work is chunked over
+    vertices so memory stays at chunk_size * k matrices.
+    """
+    result = np.empty_like(coords, dtype=np.float32)
+    unweighted = weights.sum(axis=1) <= 0
+    for start in range(0, len(coords), chunk_size):
+        end = start + chunk_size
+        blended = np.einsum("nk,nkij->nij", weights[start:end], skin[bones[start:end]])
+        result[start:end] = np.einsum("nij,nj->ni", blended[:, :, :3], coords[start:end]) + blended[:, :, 3]
+    result[unweighted] = coords[unweighted]
+    return result
+
+
+def iter_lbs_poses(coords, bones, weights, skins, chunk_size=65536):
+    """Yield (pose index, (n, 3) positions) for every pose in skins (f, b, 3, 4)"""
+    for index in range(len(skins)):
+        yield index, lbs_positions(coords, bones, weights, skins[index], chunk_size)
+
+
+# Last influence-limit report per object name (kept until file load)
+_influence_error_reports = ToolkitCache(track_updates=False)
+
+
+def limit_influences(bones, weights, k):
+    """Keep the k heaviest of sorted padded influences and renormalize"""
+    bones, weights = bones[:, :k], weights[:, :k].copy()
+    totals = weights.sum(axis=1, keepdims=True)
+    np.divide(weights, totals, out=weights, where=totals > 0)
+    return bones, weights
+
+
+def measure_influence_limit_error(coords, bones, weights, skins, k, chunk_size=65536):
+    """Deformation error of limiting to k influences over a set of poses
+
+    Only vertices with more than k influences can differ, so the rest are skipped.
+    Returns (per-vertex max error (n,), per-pose max error (f,)).
+    """
+    vertex_error = np.zeros(len(coords), dtype=np.float32)
+    pose_error = np.zeros(len(skins), dtype=np.float32)
+    rows = np.nonzero(np.count_nonzero(weights > 0, axis=1) > k)[0]
+    if not len(rows):
+        return vertex_error, pose_error
+    
+    coords, bones, weights = coords[rows], bones[rows], weights[rows]
+    limited_bones, limited_weights = limit_influences(bones, weights, k)
+    for index in range(len(skins)):
+        full = lbs_positions(coords, bones, weights, skins[index], chunk_size)
+        limited = lbs_positions(coords, limited_bones, limited_weights, skins[index], chunk_size)
+        error = np.linalg.norm(full - limited, axis=1)
+        np.maximum(vertex_error[rows], error, out=error)
+        vertex_error[rows] = error
+        pose_error[index] = error.max()
+    return vertex_error, pose_error
+
+
+def get_influence_error_report(obj):
+    """Return the last influence-limit report for obj or None"""
+    return _influence_error_reports.get(obj.name) if obj else None
+
+
+def get_action_frames(armature, step=1, action=None):
+    """Frames of action (default: the armature's active action, or the scene range) for pose validation"""
+    if action is None:
+        anim = armature.animation_data
+        action = anim.action if anim else None
+    if action:
+        start, end = action.frame_range
+    else:
+        scene = bpy.context.scene
+        start, end = scene.frame_start, scene.frame_end
+    return action, np.arange(int(start), int(end) + 1, max(1, step))
+
+
+# Enum items must stay referenced on the Python side while Blender shows them
+_action_items = []
+
+
+def get_action_items(self, context):
+    """Action choices for pose validation: the active action first, then every action"""
+    _action_items[:] = [("ACTIVE", "Active Action", "Use the armature's active action")]
+    _action_items.extend(
+        (action.name, action.name, f"Use the poses of '{action.name}'")
+        for action in bpy.data.actions
+    )
+    return _action_items
 
 
 # ==================== OPERATORS ====================
 
 class EMESH_OT_SetVertexToRoot(ToolkitOperator):
-    """Snap selected vertices to their most influential bone's head position"""
+    """Snap selected vertices to their most influential bone's head, tail or axis"""
     bl_idname = "mesh.emesh_set_vertex_to_root"
     bl_label = "Snap to Bone Root"
     bl_options = {"REGISTER", "UNDO"}
@@ -23,17 +343,34 @@ class EMESH_OT_SetVertexToRoot(ToolkitOperator):
         max=4,
         description="Number of most influential bones to average (1=single, 2+=interpolated)"
     )
+    space: bpy.props.EnumProperty(
+        name="Space",
+        items=[
+            ("REST", "Rest", "Use rest-pose bone positions"),
+            ("POSE", "Pose", "Use current pose bone positions"),
+        ],
+        default="REST"
+    )
+    target: bpy.props.EnumProperty(
+        name="Target",
+        items=[
+            ("HEAD", "Head", "Snap to the bone head"),
+            ("TAIL", "Tail", "Snap to the bone tail"),
+            ("CLOSEST", "Closest", "Snap to the closest point on the head-tail segment"),
+        ],
+        default="HEAD"
+    )
+    
+    all_selected: bpy.props.BoolProperty(
+        name="All Selected Meshes",
+        default=False,
+        description="Snap on every selected mesh bound to the active mesh's armature"
+    )
     
     @classmethod
     def poll(cls, context):
         obj = ToolkitUtils.get_active_mesh_obj(context)
-        if not obj:
-            return False
-        
-        for mod in obj.modifiers:
-            if mod.type == "ARMATURE" and mod.object:
-                return True
-        return False
+        return obj is not None and get_armature_object(obj) is not None
     
     def execute(self, context):
         obj = ToolkitUtils.get_active_mesh_obj(context)
@@ -41,82 +378,398 @@ class EMESH_OT_SetVertexToRoot(ToolkitOperator):
         if not obj:
             return {"CANCELLED"}
         
-        # Find armature modifier
-        armature = None
-        for mod in obj.modifiers:
-            if mod.type == "ARMATURE" and mod.object:
-                armature = mod.object
-                break
-        
+        armature = get_armature_object(obj)
         if not armature:
             return self.report_error("No armature modifier found")
         
-        # Check if we're working with a shapekey
-        shape_keys = obj.data.shape_keys
-        is_shapekey_mode = (
-            shape_keys and 
-            shape_keys.active_index > 0 and 
-            shape_keys.active_index < len(shape_keys.key_blocks)
+        objects = [obj]
+        if self.all_selected:
+            objects += [
+                o for o in context.selected_objects
+                if o.type == "MESH" and o != obj and get_armature_object(o) == armature
+            ]
+        
+        # One mode switch covers every object: multi-object edit mode exits and
+        # re-enters together, and selections are then read from mesh data in bulk
+        original_mode = obj.mode
+        ToolkitUtils.set_mode(obj, "OBJECT")
+        
+        # Armature-side data computed once for all objects
+        heads, tails, _ = get_armature_segments(armature, pose=self.space == "POSE")
+        
+        total = 0
+        selected_total = 0
+        snapped_objects = 0
+        shapekey_names = []
+        for target_obj in objects:
+            selected, count, shapekey = self.snap_object(target_obj, armature, heads, tails)
+            selected_total += selected
+            if count:
+                total += count
+                snapped_objects += 1
+                if shapekey:
+                    shapekey_names.append(shapekey.name)
+        
+        ToolkitUtils.set_mode(obj, original_mode)
+        
+        if not selected_total:
+            return self.report_warning("No vertices selected")
+        if not total:
+            return self.report_warning("Selected vertices have no bone weights")
+        
+        mode_text = f" in '{shapekey_names[0]}'" if len(objects) == 1 and shapekey_names else ""
+        object_text = f" on {snapped_objects} objects" if len(objects) > 1 else ""
+        return self.report_info(
+            f"Snapped {total} vertices to {self.space.lower()} bone {self.target.lower()}{mode_text}{object_text}"
         )
+    
+    def snap_object(self, obj, armature, heads, tails):
+        """Snap one object's selected vertices; returns (selected count, snapped count, shapekey or None)"""
+        mesh = obj.data
+        selected = np.zeros(len(mesh.vertices), dtype=bool)
+        mesh.vertices.foreach_get("select", selected)
+        if not selected.any():
+            return 0, 0, None
         
+        # Check if we're working with a shapekey
+        shape_keys = mesh.shape_keys
+        active_index = obj.active_shape_key_index
         shapekey = None
-        if is_shapekey_mode:
-            shapekey = shape_keys.key_blocks[shape_keys.active_index]
+        if shape_keys and 0 < active_index < len(shape_keys.key_blocks):
+            shapekey = shape_keys.key_blocks[active_index]
         
-        # Get vertex groups
-        vgroups = obj.vertex_groups
-        bones = armature.data.bones
+        obj_heads, obj_tails = segments_to_object(obj, armature, heads, tails)
+        table = WeightTable.from_mesh(mesh)
+        table = table.select(selected[table.vertex_ids()])
+        rows, bones, factors = top_bone_weights(
+            table, get_group_bone_indices(obj, armature), self.interpolate_bones
+        )
+        if not len(rows):
+            return int(selected.sum()), 0, shapekey
+        
+        target = shapekey.data if shapekey else mesh.vertices
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        target.foreach_get("co", coords)
+        coords = coords.reshape(-1, 3)
+        
+        points = bone_target_points(self.target, obj_heads, obj_tails, bones, coords[rows].astype(np.float64))
+        coords[rows] = np.einsum("nk,nkj->nj", factors, points)
+        
+        # Set positions (in shapekey or base mesh) with a single bulk write
+        target.foreach_set("co", coords.ravel())
+        mesh.update()
+        return int(selected.sum()), len(rows), shapekey
+
+
+class EMESH_OT_EvaluatePoseSkinning(ToolkitOperator):
+    """Skin the active mesh through every frame of the armature's action in NumPy"""
+    bl_idname = "mesh.emesh_evaluate_pose_skinning"
+    bl_label = "Evaluate Pose Skinning"
+    
+    frame_step: bpy.props.IntProperty(
+        name="Frame Step",
+        default=1,
+        min=1,
+        max=100
+    )
+    
+    @classmethod
+    def poll(cls, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        return obj is not None and get_armature_object(obj) is not None
+    
+    def execute(self, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        armature = get_armature_object(obj) if obj else None
+        
+        if not armature:
+            return self.report_error("No armature modifier found")
+        
+        if obj.mode == "EDIT":
+            obj.update_from_editmode()
+        
+        start = time.perf_counter()
+        action, frames = get_action_frames(armature, self.frame_step)
+        skins = get_skinning_matrices(obj, armature, collect_pose_matrices(armature, action, frames))
+        coords = read_vertex_coords(obj.data)
+        bones, weights = get_skinning_weights(obj, armature)
+        
+        worst, worst_frame = 0.0, None
+        for index, positions in iter_lbs_poses(coords, bones, weights, skins):
+            displacement = float(np.linalg.norm(positions - coords, axis=1).max()) if len(coords) else 0.0
+            if displacement > worst:
+                worst, worst_frame = displacement, int(frames[index])
+        
+        elapsed = time.perf_counter() - start
+        rate = len(frames) / elapsed if elapsed > 0 else 0.0
+        at_frame = f" at frame {worst_frame}" if worst_frame is not None else ""
+        return self.report_info(
+            f"Skinned {len(frames)} poses in {elapsed:.2f}s ({rate:.0f}/s), "
+            f"max displacement {worst:.4f}{at_frame}"
+        )
+
+
+class EMESH_OT_InfluenceLimitError(ToolkitOperator):
+    """Measure how much limiting to Max Bone Groups changes deformation across an action's poses"""
+    bl_idname = "mesh.emesh_influence_limit_error"
+    bl_label = "Influence Limit Error"
+    
+    action: bpy.props.EnumProperty(
+        name="Action",
+        items=get_action_items,
+        description="Action whose poses are measured"
+    )
+    frame_step: bpy.props.IntProperty(
+        name="Frame Step",
+        default=1,
+        min=1,
+        max=100
+    )
+    tolerance: bpy.props.FloatProperty(
+        name="Tolerance",
+        default=0.001,
+        min=0.0,
+        subtype="DISTANCE",
+        description="Only overlay vertices whose error exceeds this"
+    )
+    max_display: bpy.props.IntProperty(
+        name="Max Displayed",
+        default=5000,
+        min=10,
+        max=50000,
+        description="Overlay only the worst vertices"
+    )
+    
+    @classmethod
+    def poll(cls, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        return obj is not None and get_armature_object(obj) is not None
+    
+    def execute(self, context):
+        props = context.scene.emesh_toolkit
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        armature = get_armature_object(obj) if obj else None
+        
+        if not armature:
+            return self.report_error("No armature modifier found")
+        
+        if obj.mode == "EDIT":
+            obj.update_from_editmode()
+        
+        k = props.max_bone_groups
+        action = bpy.data.actions.get(self.action) if self.action != "ACTIVE" else None
+        action, frames = get_action_frames(armature, self.frame_step, action)
+        skins = get_skinning_matrices(obj, armature, collect_pose_matrices(armature, action, frames))
+        coords = read_vertex_coords(obj.data)
+        bones, weights = get_skinning_weights(obj, armature)
+        vertex_error, pose_error = measure_influence_limit_error(coords, bones, weights, skins, k)
+        
+        worst = np.argsort(-vertex_error)[:self.max_display]
+        worst = worst[vertex_error[worst] > self.tolerance]
+        
+        props.influence_error_overlay_data.clear()
+        for index, co in zip(worst.tolist(), to_world_coords(obj, coords[worst])):
+            item = props.influence_error_overlay_data.add()
+            item.index = index
+            item.x, item.y, item.z = co
+        toolkit_overlay.tag_layer("influence_error_overlay_data")
+        
+        order = np.argsort(-pose_error)
+        _influence_error_reports.set(obj.name, {
+            "k": k,
+            "poses": [(int(frames[i]), float(pose_error[i])) for i in order.tolist()],
+            "affected": int(np.count_nonzero(vertex_error > self.tolerance)),
+            "max_error": float(vertex_error.max()) if len(vertex_error) else 0.0,
+        })
+        
+        peak = float(pose_error.max()) if len(pose_error) else 0.0
+        return self.report_info(
+            f"Limit {k}: max error {peak:.4f} over {len(frames)} poses, "
+            f"{int(np.count_nonzero(vertex_error > self.tolerance))} vertices above tolerance"
+        )
+
+
+class EMESH_OT_AutoSkinWeights(ToolkitOperator):
+    """Weight vertices to their nearest deform bones by distance (fast alternative to heat weighting)"""
+    bl_idname = "mesh.emesh_auto_skin_weights"
+    bl_label = "Auto Skin Weights"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    nearest_bones: bpy.props.IntProperty(
+        name="Nearest Bones",
+        default=4,
+        min=1,
+        max=16,
+        description="Bone segments considered per vertex before the Max Bone Groups limit"
+    )
+    falloff: bpy.props.FloatProperty(
+        name="Falloff",
+        default=2.0,
+        min=0.5,
+        max=8.0,
+        description="Inverse distance power; higher values favour the nearest bone"
+    )
+    smooth_iterations: bpy.props.IntProperty(
+        name="Smooth Iterations",
+        default=3,
+        min=0,
+        max=100,
+        description="Laplacian smoothing passes over mesh edges (0 = off)"
+    )
+    smooth_factor: bpy.props.FloatProperty(
+        name="Smooth Factor",
+        default=0.5,
+        min=0.0,
+        max=1.0
+    )
+    selected_only: bpy.props.BoolProperty(
+        name="Selected Only",
+        default=False,
+        description="Only weight selected vertices (others keep their deform weights)"
+    )
+    prune: bpy.props.FloatProperty(
+        name="Prune Below",
+        default=0.001,
+        min=0.0,
+        max=0.1,
+        precision=4,
+        description="Drop weights below this value before normalizing"
+    )
+    
+    # Group columns smoothed at once; bounds memory to num_verts * BLOCK floats
+    BLOCK = 32
+    
+    @classmethod
+    def poll(cls, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        return obj is not None and obj.data.vertices and get_armature_object(obj) is not None
+    
+    def execute(self, context):
+        props = context.scene.emesh_toolkit
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        armature = get_armature_object(obj) if obj else None
+        
+        if not armature:
+            return self.report_error("No armature modifier found")
+        
+        deform = np.array([bone.use_deform for bone in armature.data.bones], dtype=bool)
+        if not deform.any():
+            return self.report_warning("Armature has no deform bones")
         
-        # Switch to object mode to read vertex selection
         original_mode = obj.mode
         ToolkitUtils.set_mode(obj, "OBJECT")
         
-        selected_verts = [v for v in obj.data.vertices if v.select]
-        
-        if not selected_verts:
+        mesh = obj.data
+        num_verts = len(mesh.vertices)
+        mask = np.ones(num_verts, dtype=bool)
+        if self.selected_only:
+            mesh.vertices.foreach_get("select", mask)
+        if not mask.any():
             ToolkitUtils.set_mode(obj, original_mode)
             return self.report_warning("No vertices selected")
         
-        count = 0
-        for vert in selected_verts:
-            if not vert.groups:
-                continue
-            
-            # Collect bone weights (top N influential)
-            bone_weights = []
-            for g in vert.groups:
-                if g.weight > 0 and g.group < len(vgroups):
-                    vgroup_name = vgroups[g.group].name
-                    if vgroup_name in bones:
-                        bone_weights.append((vgroup_name, g.weight))
-            
-            if not bone_weights:
-                continue
-            
-            # Sort by weight and take top N
-            bone_weights.sort(key=lambda x: x[1], reverse=True)
-            top_bones = bone_weights[:self.interpolate_bones]
-            
-            # Calculate interpolated position
-            total_weight = sum(w for _, w in top_bones)
-            final_pos = Vector((0, 0, 0))
-            
-            for bone_name, weight in top_bones:
-                bone = bones[bone_name]
-                bone_head_world = armature.matrix_world @ bone.head_local
-                bone_head_obj = obj.matrix_world.inverted() @ bone_head_world
-                final_pos += bone_head_obj * (weight / total_weight)
-            
-            # Set position (in shapekey or base mesh)
-            if shapekey:
-                shapekey.data[vert.index].co = final_pos
+        # Distances to every deform bone segment, in object space
+        heads, tails, names = get_bone_segments(obj, armature)
+        deform_bones = np.nonzero(deform)[0]
+        rows = np.nonzero(mask)[0]
+        nearest, distances = nearest_bone_segments(
+            read_vertex_coords(mesh)[rows], heads[deform_bones], tails[deform_bones], self.nearest_bones
+        )
+        nearest = deform_bones[nearest]
+        weights = falloff_weights(distances, self.falloff)
+        
+        # Bone index -> vertex group index. Bones without a group get provisional
+        # indices past the existing groups; only those still weighted after pruning
+        # are created below, so no empty groups are left behind
+        vgroups = obj.vertex_groups
+        num_existing = len(vgroups)
+        group_of = np.full(len(names), -1, dtype=np.int64)
+        missing = []
+        for bone in np.unique(nearest).tolist():
+            vg = vgroups.get(names[bone])
+            if vg:
+                group_of[bone] = vg.index
             else:
-                vert.co = final_pos
-            count += 1
+                group_of[bone] = num_existing + len(missing)
+                missing.append(names[bone])
+        num_groups = num_existing + len(missing)
+        
+        # Current deform elements of unmasked vertices: kept as they are, and read
+        # as neighbours so smoothing at the selection border blends into them
+        deform_names = {names[b] for b in deform_bones.tolist()}
+        deform_mask = get_deform_group_mask(obj, deform_names)
+        current = WeightTable.from_mesh(mesh)
+        keep = ~mask[current.vertex_ids()] & deform_mask[current.groups]
+        
+        table = WeightTable.from_elements(
+            num_verts, np.repeat(rows, nearest.shape[1]), group_of[nearest].ravel(), weights.ravel()
+        )
+        if self.smooth_iterations:
+            if not mask.all():
+                table = WeightTable.from_elements(
+                    num_verts,
+                    np.concatenate((table.vertex_ids(), current.vertex_ids()[keep])),
+                    np.concatenate((table.groups, current.groups[keep])),
+                    np.concatenate((table.weights, current.weights[keep])),
+                )
+            table = self.smooth(mesh, table, mask, num_groups)
+        
+        # Cap at Max Bone Groups and renormalize what is left
+        groups, weights = table.top_k(max(1, props.max_bone_groups))
+        weights[weights < self.prune] = 0.0
+        sums = weights.sum(axis=1, keepdims=True)
+        np.divide(weights, sums, out=weights, where=sums > 0)
+        keep_new = (weights > 0) & mask[:, None]
+        new_rows = np.nonzero(keep_new)[0]
+        
+        # Create the provisional groups that kept weight and map them to their real index
+        group_index = np.arange(num_groups)
+        used_groups = np.unique(groups[keep_new])
+        for index in used_groups[used_groups >= num_existing].tolist():
+            group_index[index] = vgroups.new(name=missing[index - num_existing]).index
+        new_groups = group_index[groups[keep_new]]
+        
+        # Unmasked vertices keep their current deform elements
+        result = WeightTable.from_elements(
+            num_verts,
+            np.concatenate((new_rows, current.vertex_ids()[keep])),
+            np.concatenate((new_groups, current.groups[keep])),
+            np.concatenate((weights[keep_new], current.weights[keep])),
+        )
+        deform_mask = get_deform_group_mask(obj, deform_names)
+        write_weight_table(obj, result, np.nonzero(deform_mask)[0])
         
         ToolkitUtils.set_mode(obj, original_mode)
-        mode_text = f" in '{shapekey.name}'" if shapekey else ""
-        return self.report_info(f"Snapped {count} vertices to bone roots{mode_text}")
+        return self.report_info(
+            f"Weighted {len(rows)} vertices to {len(used_groups)} bones "
+            f"(max {props.max_bone_groups} per vertex)"
+        )
+    
+    def smooth(self, mesh, table, mask, num_groups):
+        """Laplacian smoothing of the masked rows, one block of group columns at a time"""
+        _, indptr, indices = get_vertex_adjacency(mesh)
+        used = np.unique(table.groups)
+        vertex_parts, group_parts, weight_parts = [], [], []
+        
+        for start in range(0, len(used), self.BLOCK):
+            columns = used[start:start + self.BLOCK]
+            block = dense_group_block(table, columns, num_groups)
+            
+            for _ in range(self.smooth_iterations):
+                target = neighbor_mean(indptr, indices, block)
+                block[mask] += self.smooth_factor * (target[mask] - block[mask])
+            
+            rows, cols = np.nonzero((block > 0) & mask[:, None])
+            vertex_parts.append(rows)
+            group_parts.append(columns[cols])
+            weight_parts.append(block[rows, cols])
+        
+        return WeightTable.from_elements(
+            table.num_verts,
+            np.concatenate(vertex_parts),
+            np.concatenate(group_parts),
+            np.concatenate(weight_parts),
+        )
 
 
 # ==================== UI ====================
@@ -129,6 +782,7 @@ class EMESH_PT_Rigging(ToolkitPanel):
     bl_options = {"DEFAULT_CLOSED"}
     
     def draw(self, context):
+        props = context.scene.emesh_toolkit
         layout = self.layout
         obj = ToolkitUtils.get_active_mesh_obj(context)
         
@@ -136,33 +790,38 @@ class EMESH_PT_Rigging(ToolkitPanel):
         info_box = layout.box()
         info_box.label(text="Object Information", icon="INFO")
         
-        has_armature = False
-        if obj:
-            for mod in obj.modifiers:
-                if mod.type == "ARMATURE" and mod.object:
-                    has_armature = True
-                    info_box.label(text=f"Armature: {mod.object.name}", icon="ARMATURE_DATA")
-                    
-                    # Check shapekey mode - use obj.active_shape_key_index instead
-                    if obj.data.shape_keys and obj.active_shape_key_index > 0:
-                        try:
-                            kb = obj.data.shape_keys.key_blocks[obj.active_shape_key_index]
-                            info_box.label(text=f"Shapekey: {kb.name}", icon="SHAPEKEY_DATA")
-                        except:
-                            pass
-                    break
+        binding = get_rig_binding(obj) if obj else None
+        has_armature = binding is not None and binding.armature is not None
+        if has_armature:
+            info_box.label(text=f"Armature: {binding.armature.name}", icon="ARMATURE_DATA")
+            info_box.label(
+                text=f"Deform bones: {len(binding.deform_names)} ({len(binding.group_index)} with groups)",
+                icon="BONE_DATA"
+            )
+            
+            # Check shapekey mode - use obj.active_shape_key_index instead
+            if obj.data.shape_keys and obj.active_shape_key_index > 0:
+                try:
+                    kb = obj.data.shape_keys.key_blocks[obj.active_shape_key_index]
+                    info_box.label(text=f"Shapekey: {kb.name}", icon="SHAPEKEY_DATA")
+                except:
+                    pass
         
         if not has_armature:
             info_box.label(text="No armature modifier found", icon="ERROR")
         else:
             # ===== SNAP TO ROOT SECTION =====
             snap_box = layout.box()
-            snap_box.label(text="Snap Vertices to Bone Root", icon="SNAP_ON")
+            snap_box.label(text="Snap Vertices to Bone", icon="SNAP_ON")
             
             # Settings
             settings_box = snap_box.box()
             settings_box.label(text="Settings", icon="PREFERENCES")
             settings_box.label(text="Bones to blend (1=single, 2+=avg)", icon="INFO")
+            settings_row = settings_box.row(align=True)
+            settings_row.prop(props, "snap_space", expand=True)
+            settings_box.row(align=True).prop(props, "snap_target", expand=True)
+            settings_box.prop(props, "snap_all_selected")
             
             # Bone interpolation buttons - quick access
             button_box = snap_box.box()
@@ -172,17 +831,50 @@ class EMESH_PT_Rigging(ToolkitPanel):
             for i in range(1, 3):
                 op = row1.operator("mesh.emesh_set_vertex_to_root", text=str(i), emboss=True)
                 op.interpolate_bones = i
+                op.space = props.snap_space
+                op.target = props.snap_target
+                op.all_selected = props.snap_all_selected
             
             row2 = button_box.row(align=True)
             for i in range(3, 5):
                 op = row2.operator("mesh.emesh_set_vertex_to_root", text=str(i), emboss=True)
                 op.interpolate_bones = i
+                op.space = props.snap_space
+                op.target = props.snap_target
+                op.all_selected = props.snap_all_selected
+            
+            # ===== AUTO WEIGHTS SECTION =====
+            auto_box = layout.box()
+            auto_box.label(text="Auto Weights", icon="MOD_VERTEX_WEIGHT")
+            auto_box.operator("mesh.emesh_auto_skin_weights", text="Distance Skin Weights", icon="BONE_DATA")
+            
+            # ===== POSE VALIDATION SECTION =====
+            pose_box = layout.box()
+            pose_box.label(text="Pose Validation", icon="ARMATURE_DATA")
+            pose_box.operator("mesh.emesh_evaluate_pose_skinning", text="Skin Action Frames", icon="PLAY")
+            
+            error_row = pose_box.row(align=True)
+            error_row.operator("mesh.emesh_influence_limit_error", text=f"Limit Error (K={props.max_bone_groups})", icon="MOD_VERTEX_WEIGHT")
+            error_row.prop(props, "overlay_influence_error", text="", icon="OVERLAY")
+            
+            report = get_influence_error_report(obj)
+            if report:
+                report_col = pose_box.box().column(align=True)
+                report_col.label(text=f"K={report['k']}: max {report['max_error']:.4f}, {report['affected']} vertices")
+                for frame, error in report["poses"][:5]:
+                    report_col.label(text=f"Frame {frame}: {error:.4f}", icon="ERROR" if error > 0 else "CHECKMARK")
+                if props.influence_error_overlay_data:
+                    op = report_col.operator("mesh.emesh_select_overlay_vertices", text="Select Worst", icon="RESTRICT_SELECT_OFF")
+                    op.layer = "influence_error_overlay_data"
 
 
 # ==================== REGISTRATION ====================
 
 classes = (
     EMESH_OT_SetVertexToRoot,
+    EMESH_OT_EvaluatePoseSkinning,
+    EMESH_OT_InfluenceLimitError,
+    EMESH_OT_AutoSkinWeights,
     EMESH_PT_Rigging,
 )
 
@@ -190,8 +882,15 @@ classes = (
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
+    
+    toolkit_overlay.register_layer(
+        "influence_error_overlay_data", (1.0, 1.0, 1.0, 1.0), 8.0,
+        toggle="overlay_influence_error", source="influence_error_overlay_data"
+    )
 
 
 def unregister():
+    toolkit_overlay.unregister_layer("influence_error_overlay_data")
+    
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
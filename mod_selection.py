@@ -3,8 +3,335 @@ Emil's Mesh Toolkit - Selection Module
 Tools for advanced object selection
 """
 
+import hashlib
+
 import bpy
-from .toolkit_common import ToolkitUtils, ToolkitOperator, ToolkitPanel
+import numpy as np
+from .toolkit_common import ToolkitUtils, ToolkitOperator, ToolkitPanel, ToolkitCache
+from .mod_weights import WeightTable, get_bound_meshes, get_rig_binding
+
+
+# ==================== DATA ====================
+
+class HierarchyIndex:
+    """Parent -> children lookup over all objects, built in one pass
+
+    children maps a parent object's pointer to its child objects; bone_children maps
+    (armature pointer, bone name) to the objects parented to that bone. Pointers stay
+    valid across renames; undo/redo clears the cache before they can dangle.
+    """
+    __slots__ = ("children", "bone_children")
+    
+    def __init__(self, objects):
+        self.children = {}
+        self.bone_children = {}
+        for obj in objects:
+            parent = obj.parent
+            if parent is None:
+                continue
+            self.children.setdefault(parent.as_pointer(), []).append(obj)
+            if obj.parent_type == "BONE" and obj.parent_bone:
+                self.bone_children.setdefault((parent.as_pointer(), obj.parent_bone), []).append(obj)
+    
+    def get_children(self, obj):
+        """Direct children of obj"""
+        return self.children.get(obj.as_pointer(), ())
+    
+    def get_bone_subtree_objects(self, armature, bone):
+        """Objects parented to bone or any bone below it, walking the bone tree once"""
+        result = []
+        stack = [bone]
+        while stack:
+            bone = stack.pop()
+            # Bone renames do not tag transforms, so recheck the parent bone
+            result.extend(
+                obj for obj in self.bone_children.get((armature.as_pointer(), bone.name), ())
+                if obj.parent_bone == bone.name
+            )
+            stack.extend(bone.children)
+        return result
+    
+    def get_descendants(self, obj, allowed=None):
+        """All descendants of obj, depth first; recursion stops at objects outside allowed"""
+        result = []
+        visited = {obj.as_pointer()}
+        stack = [obj]
+        while stack:
+            for child in self.children.get(stack.pop().as_pointer(), ()):
+                pointer = child.as_pointer()
+                if pointer in visited or (allowed is not None and pointer not in allowed):
+                    continue
+                visited.add(pointer)
+                result.append(child)
+                stack.append(child)
+        return result
+
+
+# Parenting changes tag transforms and adding/removing objects tags collections (or the
+# scene, for the master collection); edits to mesh data leave both caches alone.
+_hierarchy_cache = ToolkitCache(geometry=False, transform=True, clear_on=("COLLECTION", "SCENE"))
+
+
+def get_hierarchy_index():
+    """Cached HierarchyIndex over bpy.data.objects"""
+    index = _hierarchy_cache.get(("hierarchy",))
+    if index is None:
+        objects = bpy.data.objects
+        index = _hierarchy_cache.set(("hierarchy",), HierarchyIndex(objects), objects.keys())
+    return index
+
+
+def get_view_layer_pointers(view_layer):
+    """Cached set of object pointers in view_layer, revalidated by object count"""
+    key = ("view_layer", view_layer.as_pointer())
+    count = len(view_layer.objects)
+    cached = _hierarchy_cache.get(key)
+    if cached is not None and cached[0] == count:
+        return cached[1]
+    pointers = {obj.as_pointer() for obj in view_layer.objects}
+    return _hierarchy_cache.set(key, (count, pointers))[1]
+
+
+def world_bounds(objects):
+    """World-space AABBs of objects as (n, 3) mins and maxs
+
+    objects may be a bpy collection (read with foreach_get) or a list of objects.
+    """
+    count = len(objects)
+    matrices = np.empty(count * 16, dtype=np.float32)
+    corners = np.empty(count * 24, dtype=np.float32)
+    if hasattr(objects, "foreach_get"):
+        objects.foreach_get("matrix_world", matrices)
+        objects.foreach_get("bound_box", corners)
+    else:
+        for i, obj in enumerate(objects):
+            matrices[i * 16:i * 16 + 16] = [v for col in obj.matrix_world.col for v in col]
+            corners[i * 24:i * 24 + 24] = [v for corner in obj.bound_box for v in corner]
+    
+    # foreach_get yields column-major matrices
+    matrices = matrices.reshape(-1, 4, 4).transpose(0, 2, 1).astype(np.float64)
+    corners = corners.reshape(-1, 8, 3)
+    world = np.einsum("nij,nkj->nki", matrices[:, :3, :3], corners) + matrices[:, None, :3, 3]
+    return world.min(axis=1), world.max(axis=1)
+
+
+class BoundsIndex:
+    """World AABBs of a view layer's objects with per-row dirty flags"""
+    __slots__ = ("objects", "rows", "mins", "maxs", "dirty")
+    
+    def __init__(self, view_layer):
+        objects = view_layer.objects
+        self.objects = list(objects)
+        self.rows = {obj.as_pointer(): i for i, obj in enumerate(self.objects)}
+        self.mins, self.maxs = world_bounds(objects)
+        self.dirty = np.zeros(len(self.objects), dtype=bool)
+    
+    def mark_dirty(self, pointer):
+        row = self.rows.get(pointer)
+        if row is not None:
+            self.dirty[row] = True
+    
+    def refresh(self):
+        """Recompute bounds of objects moved since the last query"""
+        rows = np.nonzero(self.dirty)[0]
+        if len(rows):
+            mins, maxs = world_bounds([self.objects[i] for i in rows.tolist()])
+            self.mins[rows] = mins
+            self.maxs[rows] = maxs
+            self.dirty[rows] = False
+    
+    def query_sphere(self, center, radius):
+        """Rows whose AABB intersects the sphere"""
+        nearest = np.clip(center, self.mins, self.maxs)
+        distance2 = np.einsum("ij,ij->i", nearest - center, nearest - center)
+        return np.nonzero(distance2 <= radius * radius)[0]
+    
+    def query_box(self, lo, hi):
+        """Rows whose AABB overlaps the box lo..hi"""
+        return np.nonzero(np.all((self.mins <= hi) & (self.maxs >= lo), axis=1))[0]
+
+
+class BoundsCache(ToolkitCache):
+    """ToolkitCache of BoundsIndex entries: moved objects mark their row dirty instead of dropping the index"""
+    
+    def handle_update(self, update):
+        id_data = update.id
+        if id_data.id_type in self.clear_on:
+            self.clear()
+            return
+        if id_data.id_type == "OBJECT" and (update.is_updated_transform or update.is_updated_geometry):
+            for index in self.entries.values():
+                index.mark_dirty(id_data.original.as_pointer())
+
+
+_bounds_cache = BoundsCache(clear_on=("COLLECTION",))
+
+
+def get_bounds_index(view_layer):
+    """Cached, refreshed BoundsIndex for view_layer"""
+    key = view_layer.as_pointer()
+    index = _bounds_cache.get(key)
+    if index is None or len(index.objects) != len(view_layer.objects):
+        index = _bounds_cache.set(key, BoundsIndex(view_layer))
+    else:
+        index.refresh()
+    return index
+
+
+# Content hash per mesh datablock pointer, so renamed or replaced meshes never share an
+# entry; edits tag the mesh's geometry and drop it through the name dependency
+_mesh_hash_cache = ToolkitCache(geometry=True)
+
+# (collection, attribute, values per item, dtype) read into the mesh content hash
+MESH_HASH_ATTRIBUTES = (
+    ("vertices", "co", 3, np.float32),
+    ("edges", "vertices", 2, np.int32),
+    ("polygons", "loop_start", 1, np.int32),
+    ("polygons", "loop_total", 1, np.int32),
+    ("loops", "vertex_index", 1, np.int32),
+)
+
+
+def get_mesh_hash(mesh):
+    """Cached blake2b digest of a mesh's coordinates and topology"""
+    key = mesh.as_pointer()
+    cached = _mesh_hash_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    digest = hashlib.blake2b(digest_size=16)
+    for collection_name, attr, width, dtype in MESH_HASH_ATTRIBUTES:
+        collection = getattr(mesh, collection_name)
+        values = np.empty(len(collection) * width, dtype=dtype)
+        collection.foreach_get(attr, values)
+        digest.update(len(collection).to_bytes(8, "little"))
+        digest.update(values.tobytes())
+    return _mesh_hash_cache.set(key, digest.hexdigest(), (mesh.name,))
+
+
+def group_duplicate_meshes(objects):
+    """Group mesh objects by mesh content: {hash: [objects]}, hashing each datablock once"""
+    groups = {}
+    for obj in objects:
+        if obj.type != "MESH" or obj.data is None:
+            continue
+        if obj.mode == "EDIT":
+            obj.update_from_editmode()
+        groups.setdefault(get_mesh_hash(obj.data), []).append(obj)
+    return groups
+
+
+# Attribute data_type -> (foreach_get field, values per element, dtype)
+ATTRIBUTE_FIELDS = {
+    "FLOAT": ("value", 1, np.float32),
+    "INT": ("value", 1, np.int32),
+    "INT8": ("value", 1, np.int8),
+    "BOOLEAN": ("value", 1, bool),
+    "FLOAT2": ("vector", 2, np.float32),
+    "INT32_2D": ("value", 2, np.int32),
+    "FLOAT_VECTOR": ("vector", 3, np.float32),
+    "FLOAT_COLOR": ("color", 4, np.float32),
+    "BYTE_COLOR": ("color", 4, np.float32),
+    "QUATERNION": ("value", 4, np.float32),
+}
+
+
+def get_mesh_data_hash(mesh):
+    """Cached digest of mesh data beyond geometry: attributes (UVs included), custom
+    normals, shape keys and vertex weights; None if something cannot be compared"""
+    key = ("data", mesh.as_pointer())
+    cached = _mesh_hash_cache.get(key, False)
+    if cached is not False:
+        return cached
+    
+    digest = hashlib.blake2b(digest_size=16)
+    result = None
+    try:
+        for attr in sorted(mesh.attributes, key=lambda attr: attr.name):
+            if attr.name.startswith(".") or attr.name == "position":
+                continue
+            field, width, dtype = ATTRIBUTE_FIELDS[attr.data_type]
+            values = np.empty(len(attr.data) * width, dtype=dtype)
+            attr.data.foreach_get(field, values)
+            digest.update(f"{attr.name}:{attr.domain}:{attr.data_type}".encode())
+            digest.update(values.tobytes())
+        
+        if mesh.has_custom_normals:
+            if hasattr(mesh, "corner_normals"):
+                normals = mesh.corner_normals
+                values = np.empty(len(normals) * 3, dtype=np.float32)
+                normals.foreach_get("vector", values)
+            else:
+                mesh.calc_normals_split()
+                values = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+                mesh.loops.foreach_get("normal", values)
+            digest.update(b"normals")
+            digest.update(values.tobytes())
+        
+        if mesh.shape_keys:
+            for block in mesh.shape_keys.key_blocks:
+                values = np.empty(len(block.data) * 3, dtype=np.float32)
+                block.data.foreach_get("co", values)
+                digest.update(f"{block.name}:{block.relative_key.name}:{block.value}".encode())
+                digest.update(values.tobytes())
+        
+        table = WeightTable.from_mesh(mesh)
+        for values in (table.offsets, table.groups, table.weights):
+            digest.update(values.tobytes())
+        result = digest.hexdigest()
+    except (KeyError, AttributeError, RuntimeError):
+        result = None
+    return _mesh_hash_cache.set(key, result, (mesh.name,))
+
+
+def get_relink_key(obj):
+    """Everything that must match before obj can share another object's mesh, or None"""
+    data_hash = get_mesh_data_hash(obj.data)
+    if data_hash is None:
+        return None
+    return (
+        data_hash,
+        tuple(vg.name for vg in obj.vertex_groups),
+        tuple((slot.link, slot.material.name if slot.material else "") for slot in obj.material_slots),
+    )
+
+
+# Names of vertex groups with any nonzero weight, per mesh datablock name. Keyed by
+# mesh data so posing (which updates the objects) keeps the entries.
+_group_usage_cache = ToolkitCache(geometry=True)
+
+
+def get_used_group_names(obj):
+    """Cached set of obj's vertex group names that hold a nonzero weight"""
+    mesh = obj.data
+    cached = _group_usage_cache.get(mesh.name)
+    if cached is not None:
+        return cached
+    
+    if obj.mode == "EDIT":
+        obj.update_from_editmode()
+    table = WeightTable.from_mesh(mesh)
+    used = np.unique(table.groups[table.weights > 0])
+    vgroups = obj.vertex_groups
+    names = frozenset(vgroups[int(i)].name for i in used if i < len(vgroups))
+    return _group_usage_cache.set(mesh.name, names)
+
+
+def get_deformed_meshes(armature, bone_names):
+    """Mesh objects whose armature modifier uses armature and that have weight in any of bone_names"""
+    deform_names = {name for name in bone_names if armature.data.bones[name].use_deform}
+    if not deform_names:
+        return []
+    
+    result = []
+    for obj in get_bound_meshes(armature):
+        uses_groups = any(
+            target == armature and use_groups
+            for target, use_groups in get_rig_binding(obj).armature_modifiers
+        )
+        if uses_groups and not deform_names.isdisjoint(get_used_group_names(obj)):
+            result.append(obj)
+    return result
 
 
 # ==================== OPERATORS ====================
@@ -22,6 +349,7 @@ class EMESH_OT_SelectDeep(ToolkitOperator):
             ("CHILDREN", "Children", "Select all children recursively"),
             ("PARENTS", "Parents", "Select all parents up the chain"),
             ("HIERARCHY", "Full Hierarchy", "Select entire family tree"),
+            ("BONE_SUBTREE", "Bone Subtree", "Select objects parented to a bone or any of its child bones"),
         ],
         default="SIBLINGS"
     )
@@ -37,102 +365,235 @@ class EMESH_OT_SelectDeep(ToolkitOperator):
             return self.report_warning("No active object")
         
         # Filter to only objects in current view layer
-        view_layer_objs = set(obj.name for obj in context.view_layer.objects)
-        selected_count = 0
+        view_layer_objs = get_view_layer_pointers(context.view_layer)
+        index = get_hierarchy_index()
         
         if self.mode == "SIBLINGS":
             # Select siblings with same parent
             if active.parent_type == "BONE" and active.parent and active.parent_bone:
-                parent_obj = active.parent
                 parent_bone_name = active.parent_bone
-                
-                for obj in bpy.data.objects:
-                    if (obj.name in view_layer_objs and
-                        obj.parent == parent_obj and 
-                        obj.parent_type == "BONE" and 
-                        obj.parent_bone == parent_bone_name):
-                        obj.select_set(True)
-                        selected_count += 1
-                
+                siblings = index.bone_children.get((active.parent.as_pointer(), parent_bone_name), ())
+                selected_count = self.select_objects(siblings, view_layer_objs)
                 return self.report_info(f"Selected {selected_count} siblings with bone parent '{parent_bone_name}'")
             
             elif active.parent and active.parent_type == "OBJECT":
                 parent = active.parent
-                
-                for obj in bpy.data.objects:
-                    if obj.name in view_layer_objs and obj.parent == parent and obj.parent_type == "OBJECT":
-                        obj.select_set(True)
-                        selected_count += 1
-                
+                siblings = [obj for obj in index.get_children(parent) if obj.parent_type == "OBJECT"]
+                selected_count = self.select_objects(siblings, view_layer_objs)
                 return self.report_info(f"Selected {selected_count} siblings with object parent '{parent.name}'")
         
         elif self.mode == "CHILDREN":
             # Recursively select all children
-            def select_children(obj):
-                count = 0
-                for child in bpy.data.objects:
-                    if child.name in view_layer_objs and child.parent == obj:
-                        child.select_set(True)
-                        count += 1
-                        count += select_children(child)
-                return count
-            
-            selected_count = select_children(active)
+            selected_count = self.select_objects(index.get_descendants(active, view_layer_objs), view_layer_objs)
             return self.report_info(f"Selected {selected_count} children")
         
         elif self.mode == "PARENTS":
             # Select all parents up the chain
-            current = active.parent
-            while current:
-                if current.name in view_layer_objs:
-                    current.select_set(True)
-                    selected_count += 1
-                current = current.parent
-            
+            selected_count = self.select_objects(self.get_ancestors(active), view_layer_objs)
             return self.report_info(f"Selected {selected_count} parents up the chain")
         
         elif self.mode == "HIERARCHY":
             # Select entire family tree (parents + children + siblings)
-            def select_all_family(obj, visited=None):
-                if visited is None:
-                    visited = set()
-                if obj.name in visited:
-                    return 0
-                visited.add(obj.name)
-                count = 0
-                
-                # Select parents
-                current = obj.parent
-                while current and current.name not in visited:
-                    current.select_set(True)
-                    visited.add(current.name)
-                    count += 1
-                    current = current.parent
-                
-                # Select children
-                for child in bpy.data.objects:
-                    if child.parent == obj and child.name not in visited:
-                        child.select_set(True)
-                        visited.add(child.name)
-                        count += 1
-                        count += select_all_family(child, visited)
-                
-                # Select siblings
-                if obj.parent:
-                    for sibling in bpy.data.objects:
-                        if (sibling.parent == obj.parent and 
-                            sibling.name not in visited):
-                            sibling.select_set(True)
-                            visited.add(sibling.name)
-                            count += 1
-                
-                return count
-            
-            selected_count = select_all_family(active)
+            family = self.get_ancestors(active) + index.get_descendants(active)
+            if active.parent:
+                family += [obj for obj in index.get_children(active.parent) if obj != active]
+            selected_count = self.select_objects(family, view_layer_objs)
             return self.report_info(f"Selected {selected_count} family members")
         
+        elif self.mode == "BONE_SUBTREE":
+            armature, bone = self.get_subtree_root(active)
+            if not bone:
+                return self.report_warning("Need an active bone or a bone-parented active object")
+            objects = index.get_bone_subtree_objects(armature, bone)
+            selected_count = self.select_objects(objects, view_layer_objs)
+            return self.report_info(f"Selected {selected_count} objects under bone '{bone.name}'")
+        
+        return self.report_warning("Active object has no parent or unsupported parent type")
+    
+    @staticmethod
+    def get_subtree_root(active):
+        """(armature, bone) to start from: the active bone of an active armature, else the active's parent bone"""
+        if active.type == "ARMATURE":
+            return active, active.data.bones.active
+        if active.parent_type == "BONE" and active.parent and active.parent.type == "ARMATURE" and active.parent_bone:
+            return active.parent, active.parent.data.bones.get(active.parent_bone)
+        return None, None
+    
+    @staticmethod
+    def get_ancestors(obj):
+        """Parents up the chain, nearest first"""
+        ancestors = []
+        visited = {obj.as_pointer()}
+        current = obj.parent
+        while current and current.as_pointer() not in visited:
+            visited.add(current.as_pointer())
+            ancestors.append(current)
+            current = current.parent
+        return ancestors
+    
+    @staticmethod
+    def select_objects(objects, view_layer_objs):
+        """Select the given objects that are in the view layer; returns the count"""
+        count = 0
+        for obj in objects:
+            if obj.as_pointer() in view_layer_objs:
+                obj.select_set(True)
+                count += 1
+        return count
+
+
+class EMESH_OT_SelectNearby(ToolkitOperator):
+    """Select objects near the active object using a cached bounding-box index"""
+    bl_idname = "object.emesh_select_nearby"
+    bl_label = "Select Nearby"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    shape: bpy.props.EnumProperty(
+        name="Shape",
+        items=[
+            ("RADIUS", "Radius", "Objects whose bounds touch a sphere around the active object's center"),
+            ("BOX", "Box", "Objects whose bounds overlap the active object's bounds grown by the distance"),
+        ],
+        default="RADIUS"
+    )
+    distance: bpy.props.FloatProperty(
+        name="Distance",
+        default=1.0,
+        min=0.0,
+        subtype="DISTANCE",
+        description="Sphere radius or box margin"
+    )
+    visible_only: bpy.props.BoolProperty(
+        name="Visible Only",
+        default=True
+    )
+    
+    @classmethod
+    def poll(cls, context):
+        return context.active_object is not None
+    
+    def execute(self, context):
+        active = context.active_object
+        index = get_bounds_index(context.view_layer)
+        row = index.rows.get(active.as_pointer())
+        if row is None:
+            return self.report_warning("Active object is not in the view layer")
+        
+        lo, hi = index.mins[row], index.maxs[row]
+        if self.shape == "RADIUS":
+            rows = index.query_sphere((lo + hi) * 0.5, self.distance)
         else:
-            return self.report_warning("Active object has no parent or unsupported parent type")
+            rows = index.query_box(lo - self.distance, hi + self.distance)
+        
+        selected_count = 0
+        for i in rows.tolist():
+            obj = index.objects[i]
+            if obj == active or (self.visible_only and not obj.visible_get()):
+                continue
+            obj.select_set(True)
+            selected_count += 1
+        
+        return self.report_info(f"Selected {selected_count} objects within {self.distance:.3f}")
+
+
+class EMESH_OT_SelectDuplicateMeshes(ToolkitOperator):
+    """Select objects whose meshes have identical geometry, optionally relinking them to one mesh"""
+    bl_idname = "object.emesh_select_duplicate_meshes"
+    bl_label = "Select Duplicate Meshes"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    mode: bpy.props.EnumProperty(
+        name="Mode",
+        items=[
+            ("ACTIVE", "Active", "Select objects whose mesh matches the active object's"),
+            ("ALL", "All", "Select every object whose mesh duplicates another datablock"),
+        ],
+        default="ACTIVE"
+    )
+    relink: bpy.props.BoolProperty(
+        name="Relink to Shared Mesh",
+        default=False,
+        description="Point duplicates at one shared mesh (skipped when UVs, attributes, weights, shape keys, normals or materials differ)"
+    )
+    
+    def execute(self, context):
+        active = context.active_object
+        if self.mode == "ACTIVE" and (not active or active.type != "MESH"):
+            return self.report_warning("Active object is not a mesh")
+        
+        groups = group_duplicate_meshes(context.view_layer.objects)
+        if self.mode == "ACTIVE":
+            key = get_mesh_hash(active.data)
+            groups = {key: groups.get(key, [active])}
+        
+        selected_count = 0
+        relinked = 0
+        skipped = 0
+        duplicate_meshes = 0
+        for objects in groups.values():
+            meshes = {obj.data.name: obj.data for obj in objects}
+            if len(meshes) < 2:
+                continue
+            duplicate_meshes += len(meshes) - 1
+            
+            # Keep the active object's mesh, otherwise the most used one
+            if self.mode == "ACTIVE":
+                reference = active
+            else:
+                shared_mesh = max(meshes.values(), key=lambda mesh: mesh.users)
+                reference = next(obj for obj in objects if obj.data == shared_mesh)
+            shared = reference.data
+            shared_key = get_relink_key(reference) if self.relink else None
+            
+            for obj in objects:
+                if obj.data == shared and self.mode == "ALL":
+                    continue
+                obj.select_set(True)
+                selected_count += 1
+                if not self.relink or obj.data == shared:
+                    continue
+                
+                # UVs, attributes, weights, shape keys, normals and slots must match too
+                key = get_relink_key(obj)
+                if key is None or key != shared_key:
+                    skipped += 1
+                    continue
+                obj.data = shared
+                relinked += 1
+        
+        if self.relink:
+            if skipped:
+                self.report(
+                    {"WARNING"},
+                    f"Relinked {relinked} objects; skipped {skipped} whose UVs, attributes, weights, "
+                    f"shape keys, normals or materials differ"
+                )
+                return {"FINISHED"}
+            return self.report_info(f"Relinked {relinked} objects to shared meshes ({duplicate_meshes} duplicates)")
+        return self.report_info(f"Selected {selected_count} objects ({duplicate_meshes} duplicate meshes)")
+
+
+class EMESH_OT_SelectDeformedMeshes(ToolkitOperator):
+    """Select every mesh the selected bones actually deform (nonzero weight in their groups)"""
+    bl_idname = "object.emesh_select_deformed_meshes"
+    bl_label = "Select Deformed Meshes"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    @classmethod
+    def poll(cls, context):
+        obj = context.active_object
+        return obj is not None and obj.type == "ARMATURE"
+    
+    def execute(self, context):
+        armature = context.active_object
+        bone_names = [bone.name for bone in armature.data.bones if bone.select]
+        if not bone_names:
+            return self.report_warning("No bones selected")
+        
+        view_layer_objs = get_view_layer_pointers(context.view_layer)
+        meshes = get_deformed_meshes(armature, bone_names)
+        selected_count = EMESH_OT_SelectDeep.select_objects(meshes, view_layer_objs)
+        return self.report_info(f"Selected {selected_count} meshes deformed by {len(bone_names)} bones")
 
 
 # ==================== UI ====================
@@ -184,12 +645,48 @@ class EMESH_PT_Selection(ToolkitPanel):
         row3 = select_box.row(align=True)
         op = row3.operator("object.emesh_select_deep", text="Full Hierarchy", icon="OUTLINER")
         op.mode = "HIERARCHY"
+        
+        # Row 4: Bone subtree
+        row4 = select_box.row(align=True)
+        op = row4.operator("object.emesh_select_deep", text="Bone Subtree", icon="GROUP_BONE")
+        op.mode = "BONE_SUBTREE"
+        row4.label(text="Bone and child bones", icon="INFO")
+        
+        # ===== SPATIAL SECTION =====
+        props = context.scene.emesh_toolkit
+        spatial_box = layout.box()
+        spatial_box.label(text="Select Nearby", icon="SPHERE")
+        spatial_box.row(align=True).prop(props, "spatial_shape", expand=True)
+        spatial_box.prop(props, "spatial_distance")
+        op = spatial_box.operator("object.emesh_select_nearby", text="Select Nearby", icon="RESTRICT_SELECT_OFF")
+        op.shape = props.spatial_shape
+        op.distance = props.spatial_distance
+        
+        # ===== DUPLICATES SECTION =====
+        dup_box = layout.box()
+        dup_box.label(text="Duplicate Meshes", icon="DUPLICATE")
+        row = dup_box.row(align=True)
+        op = row.operator("object.emesh_select_duplicate_meshes", text="Of Active", icon="RESTRICT_SELECT_OFF")
+        op.mode = "ACTIVE"
+        op = row.operator("object.emesh_select_duplicate_meshes", text="All", icon="RESTRICT_SELECT_OFF")
+        op.mode = "ALL"
+        op = dup_box.operator("object.emesh_select_duplicate_meshes", text="Relink Duplicates", icon="LINKED")
+        op.mode = "ALL"
+        op.relink = True
+        
+        # ===== DEFORMED MESHES SECTION =====
+        deform_box = layout.box()
+        deform_box.label(text="Bone Deformation", icon="BONE_DATA")
+        deform_box.operator("object.emesh_select_deformed_meshes", text="Meshes Deformed by Selected Bones", icon="MOD_ARMATURE")
 
 
 # ==================== REGISTRATION ====================
 
 classes = (
     EMESH_OT_SelectDeep,
+    EMESH_OT_SelectNearby,
+    EMESH_OT_SelectDuplicateMeshes,
+    EMESH_OT_SelectDeformedMeshes,
     EMESH_PT_Selection,
 )
 
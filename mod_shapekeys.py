@@ -7,6 +7,40 @@ import bpy
 import numpy as np
 from mathutils import Vector
 from .toolkit_common import ToolkitUtils, ToolkitOperator, ToolkitPanel
+from . import toolkit_overlay
+
+
+# ==================== DATA ====================
+
+def find_useless_shapekeys(obj, tolerance=0.001):
+    """Get names of shapekeys identical to their relative key within tolerance"""
+    if not obj or obj.type != "MESH" or not obj.data.shape_keys:
+        return []
+    if not obj.data.shape_keys.use_relative:
+        return []
+    
+    kbs = obj.data.shape_keys.key_blocks
+    nverts = len(obj.data.vertices)
+    useless = []
+    cache = {}
+    locs = np.empty(3 * nverts, dtype=np.float32)
+    
+    for kb in kbs:
+        if kb == kb.relative_key:
+            continue
+        
+        kb.data.foreach_get("co", locs)
+        
+        if kb.relative_key.name not in cache:
+            rel_locs = np.empty(3 * nverts, dtype=np.float32)
+            kb.relative_key.data.foreach_get("co", rel_locs)
+            cache[kb.relative_key.name] = rel_locs
+        rel_locs = cache[kb.relative_key.name]
+        
+        if (np.abs(locs - rel_locs) < tolerance).all():
+            useless.append(kb.name)
+    
+    return useless
 
 
 # ==================== OVERLAY UPDATE OPERATORS ====================
@@ -17,7 +51,8 @@ class EMESH_OT_UpdateShapekeyOverlay(ToolkitOperator):
     bl_label = "Update Overlay"
     
     def execute(self, context):
-        # This just forces a redraw by the overlay handler
+        # Rebuild the shapekey overlay layers on the next redraw
+        toolkit_overlay.tag_layer("shapekey")
         return {"FINISHED"}
 
 
@@ -93,35 +128,7 @@ class EMESH_OT_DeleteUselessShapekeys(ToolkitOperator):
             return self.report_warning("No mesh objects selected")
         
         for obj in objs:
-            if not obj.data.shape_keys:
-                continue
-            if not obj.data.shape_keys.use_relative:
-                continue
-            
-            kbs = obj.data.shape_keys.key_blocks
-            nverts = len(obj.data.vertices)
-            to_delete = []
-            cache = {}
-            locs = np.empty(3 * nverts, dtype=np.float32)
-            
-            for kb in kbs:
-                if kb == kb.relative_key:
-                    continue
-                
-                kb.data.foreach_get("co", locs)
-                locs_copy = locs.copy()
-                
-                if kb.relative_key.name not in cache:
-                    rel_locs = np.empty(3 * nverts, dtype=np.float32)
-                    kb.relative_key.data.foreach_get("co", rel_locs)
-                    cache[kb.relative_key.name] = rel_locs
-                rel_locs = cache[kb.relative_key.name]
-                
-                locs_copy -= rel_locs
-                if (np.abs(locs_copy) < self.tolerance).all():
-                    to_delete.append(kb.name)
-            
-            for kb_name in to_delete:
+            for kb_name in find_useless_shapekeys(obj, self.tolerance):
                 obj.shape_key_remove(obj.data.shape_keys.key_blocks[kb_name])
                 deleted_count += 1
         
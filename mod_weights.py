@@ -3,24 +3,481 @@ Emil's Mesh Toolkit - Weights Module
 Tools for working with vertex weights
 """
 
+import json
+import os
+
 import bpy
-import gpu
-from gpu_extras.batch import batch_for_shader
+import numpy as np
 from mathutils import Vector
-from .toolkit_common import ToolkitUtils, ToolkitOperator, ToolkitPanel
+from mathutils.bvhtree import BVHTree
+from mathutils.kdtree import KDTree
+from .toolkit_common import ToolkitUtils, ToolkitOperator, ToolkitPanel, ToolkitCache
+from . import toolkit_overlay
+
+
+# ==================== WEIGHT TABLE ====================
+
+class WeightTable:
+    """Flat CSR view of a mesh's vertex group weights
+
+    Elements of vertex v live in groups/weights[offsets[v]:offsets[v + 1]].
+    """
+    
+    def __init__(self, offsets, groups, weights):
+        self.offsets = offsets
+        self.groups = groups
+        self.weights = weights
+    
+    @classmethod
+    def from_mesh(cls, mesh):
+        """Read every vertex group element of a mesh in one pass"""
+        verts = mesh.vertices
+        counts = np.fromiter((len(v.groups) for v in verts), dtype=np.int64, count=len(verts))
+        elements = [g for v in verts for g in v.groups]
+        groups = np.fromiter((g.group for g in elements), dtype=np.int32, count=len(elements))
+        weights = np.fromiter((g.weight for g in elements), dtype=np.float32, count=len(elements))
+        offsets = np.zeros(len(verts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(offsets, groups, weights)
+    
+    @classmethod
+    def from_elements(cls, num_verts, vertex_ids, groups, weights):
+        """Build a table from loose (vertex, group, weight) triples, summing duplicates"""
+        vertex_ids = np.asarray(vertex_ids, dtype=np.int64)
+        groups = np.asarray(groups, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float32)
+        
+        num_groups = int(groups.max()) + 1 if len(groups) else 1
+        keys, inverse = np.unique(vertex_ids * num_groups + groups, return_inverse=True)
+        summed = np.bincount(inverse, weights=weights, minlength=len(keys)).astype(np.float32)
+        
+        counts = np.bincount(keys // num_groups, minlength=num_verts)
+        offsets = np.zeros(num_verts + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(offsets, (keys % num_groups).astype(np.int32), summed)
+    
+    @property
+    def num_verts(self):
+        return len(self.offsets) - 1
+    
+    def counts(self):
+        """Number of elements per vertex"""
+        return np.diff(self.offsets)
+    
+    def vertex_ids(self):
+        """Vertex index of every element"""
+        return np.repeat(np.arange(self.num_verts), self.counts())
+    
+    def sums(self):
+        """Total weight per vertex"""
+        return np.bincount(self.vertex_ids(), weights=self.weights, minlength=self.num_verts)
+    
+    def select(self, mask):
+        """Keep only the elements where mask is True"""
+        counts = np.bincount(self.vertex_ids()[mask], minlength=self.num_verts)
+        offsets = np.zeros(self.num_verts + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return WeightTable(offsets, self.groups[mask], self.weights[mask])
+    
+    def gather_rows(self, rows):
+        """Return (element indices, position in rows) for all elements of the given vertices"""
+        counts = self.counts()[rows]
+        positions = np.repeat(np.arange(len(rows)), counts)
+        firsts = np.cumsum(counts) - counts
+        elements = np.arange(int(counts.sum())) - firsts[positions] + self.offsets[rows][positions]
+        return elements, positions
+    
+    def top_k(self, k):
+        """Return (groups, weights) padded to shape (num_verts, k), heaviest first
+
+        Missing slots hold group -1 and weight 0.
+        """
+        vertex_ids = self.vertex_ids()
+        order = np.lexsort((-self.weights, vertex_ids))
+        rank = np.arange(len(order)) - self.offsets[vertex_ids[order]]
+        keep = order[rank < k]
+        slot = rank[rank < k]
+        
+        groups = np.full((self.num_verts, k), -1, dtype=np.int32)
+        weights = np.zeros((self.num_verts, k), dtype=np.float32)
+        groups[vertex_ids[keep], slot] = self.groups[keep]
+        weights[vertex_ids[keep], slot] = self.weights[keep]
+        return groups, weights
+
+
+def _read_group_elements(mesh):
+    """Return the live VertexGroupElement list with matching vertex and group arrays"""
+    verts = mesh.vertices
+    counts = np.fromiter((len(v.groups) for v in verts), dtype=np.int64, count=len(verts))
+    elements = [g for v in verts for g in v.groups]
+    groups = np.fromiter((g.group for g in elements), dtype=np.int64, count=len(elements))
+    return elements, np.repeat(np.arange(len(verts)), counts), groups
+
+
+def write_weight_table(obj, table, group_indices=None):
+    """Replace the weights of the given vertex groups with the contents of table
+
+    Memberships missing from the table are removed and new ones are added with one
+    remove/add call per group; every weight is then assigned in a single pass over
+    the mesh. Groups outside group_indices are left untouched. Object mode only.
+    """
+    vgroups = obj.vertex_groups
+    num_groups = len(vgroups)
+    if group_indices is None:
+        group_indices = np.unique(table.groups)
+    
+    touched = np.zeros(num_groups, dtype=bool)
+    touched[np.asarray(group_indices, dtype=np.int64)] = True
+    
+    new_vertex_ids = table.vertex_ids()
+    new_mask = touched[table.groups]
+    new_keys = new_vertex_ids[new_mask] * num_groups + table.groups[new_mask]
+    new_weights = table.weights[new_mask]
+    key_order = np.argsort(new_keys)
+    new_keys = new_keys[key_order]
+    new_weights = new_weights[key_order]
+    
+    _, cur_vertex_ids, cur_groups = _read_group_elements(obj.data)
+    cur_mask = touched[cur_groups]
+    cur_keys = cur_vertex_ids[cur_mask] * num_groups + cur_groups[cur_mask]
+    
+    stale = cur_keys[~np.isin(cur_keys, new_keys)]
+    for gi in np.unique(stale % num_groups):
+        vgroups[int(gi)].remove((stale[stale % num_groups == gi] // num_groups).tolist())
+    
+    added = new_keys[~np.isin(new_keys, cur_keys)]
+    for gi in np.unique(added % num_groups):
+        vgroups[int(gi)].add((added[added % num_groups == gi] // num_groups).tolist(), 0.0, "REPLACE")
+    
+    elements, cur_vertex_ids, cur_groups = _read_group_elements(obj.data)
+    cur_mask = touched[cur_groups]
+    cur_keys = cur_vertex_ids[cur_mask] * num_groups + cur_groups[cur_mask]
+    values = new_weights[np.searchsorted(new_keys, cur_keys)].tolist()
+    
+    for g, w in zip((e for e, m in zip(elements, cur_mask) if m), values):
+        g.weight = w
+
+
+# Vertex adjacency per mesh datablock name. Weight edits also tag geometry updates,
+# so entries are validated against the current edge array instead.
+_adjacency_cache = ToolkitCache(track_updates=False)
+
+
+def get_vertex_adjacency(mesh):
+    """Return (edges, indptr, indices): the (e, 2) edge array and CSR vertex adjacency"""
+    num_verts = len(mesh.vertices)
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    edges = edges.reshape(-1, 2)
+    
+    cached = _adjacency_cache.get(mesh.name)
+    if cached is not None and len(cached[1]) == num_verts + 1 and np.array_equal(cached[0], edges):
+        return cached
+    
+    src = np.concatenate((edges[:, 0], edges[:, 1]))
+    dst = np.concatenate((edges[:, 1], edges[:, 0]))
+    indices = dst[np.argsort(src, kind="stable")]
+    indptr = np.zeros(num_verts + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=num_verts), out=indptr[1:])
+    
+    return _adjacency_cache.set(mesh.name, (edges, indptr, indices))
+
+
+def neighbor_mean(indptr, indices, values):
+    """Average of each vertex's neighbour rows (sparse adjacency product); isolated vertices keep their value"""
+    degree = np.diff(indptr)
+    rows = degree > 0
+    result = values.copy()
+    if rows.any():
+        sums = np.add.reduceat(values[indices], indptr[:-1][rows], axis=0)
+        result[rows] = sums / degree[rows, None]
+    return result
+
+
+def dense_group_block(table, columns, num_groups):
+    """Dense (num_verts, len(columns)) weights for the given group indices"""
+    column_of = np.full(num_groups, -1, dtype=np.int64)
+    column_of[columns] = np.arange(len(columns))
+    cols = column_of[table.groups]
+    inside = cols >= 0
+    
+    block = np.zeros((table.num_verts, len(columns)), dtype=np.float32)
+    block[table.vertex_ids()[inside], cols[inside]] = table.weights[inside]
+    return block
+
+
+# Mirror vertex maps per mesh datablock name: (tolerance, coords, partner index or -1),
+# validated against the current vertex positions
+_mirror_map_cache = ToolkitCache(track_updates=False)
+
+
+def get_mirror_vertex_map(mesh, tolerance):
+    """Map every vertex to its partner across local X (-1 when there is none)"""
+    coords = read_vertex_coords(mesh)
+    cached = _mirror_map_cache.get(mesh.name)
+    if cached is not None and cached[0] == tolerance and np.array_equal(cached[1], coords):
+        return cached[2]
+    
+    tree = KDTree(len(coords))
+    for i, co in enumerate(coords.tolist()):
+        tree.insert(co, i)
+    tree.balance()
+    
+    mirror = np.full(len(coords), -1, dtype=np.int64)
+    for i, (x, y, z) in enumerate(coords.tolist()):
+        _, index, distance = tree.find((-x, y, z))
+        if index is not None and distance <= tolerance:
+            mirror[i] = index
+    
+    _mirror_map_cache.set(mesh.name, (tolerance, coords, mirror))
+    return mirror
+
+
+def get_mirror_group_map(obj, create=False):
+    """Map every vertex group index to its .L/.R counterpart (itself when unpaired)
+
+    create adds a missing counterpart only when it is a deform bone of obj's
+    armatures, so non-bone groups (masks, modifier groups) are left alone.
+    """
+    vgroups = obj.vertex_groups
+    if create:
+        deform_names = get_rig_binding(obj).deform_names
+        for name in [vg.name for vg in vgroups]:
+            flipped = bpy.utils.flip_name(name)
+            if flipped != name and flipped not in vgroups and flipped in deform_names:
+                vgroups.new(name=flipped)
+    
+    mapping = np.arange(len(vgroups))
+    for vg in vgroups:
+        flipped = vgroups.get(bpy.utils.flip_name(vg.name))
+        if flipped:
+            mapping[vg.index] = flipped.index
+    return mapping
+
+
+def get_referenced_group_names(obj):
+    """Vertex group names used by modifiers, shapekeys or particle systems"""
+    names = set()
+    for mod in obj.modifiers:
+        for attr in ("vertex_group", "vertex_group_a", "vertex_group_b", "mask_vertex_group"):
+            name = getattr(mod, attr, "")
+            if name:
+                names.add(name)
+    
+    if obj.type == "MESH" and obj.data.shape_keys:
+        names.update(kb.vertex_group for kb in obj.data.shape_keys.key_blocks if kb.vertex_group)
+    
+    for psys in getattr(obj, "particle_systems", ()):
+        for attr in dir(psys):
+            if attr.startswith("vertex_group_"):
+                name = getattr(psys, attr, "")
+                if isinstance(name, str) and name:
+                    names.add(name)
+    return names
+
+
+def get_deform_ancestor_names(obj):
+    """Map non-deform bone names to their nearest deform ancestor (or None)"""
+    return get_rig_binding(obj).deform_ancestors()
+
+
+def get_deform_group_mask(obj, deform_group_names):
+    """Boolean array over obj.vertex_groups marking deform groups"""
+    return np.array([vg.name in deform_group_names for vg in obj.vertex_groups], dtype=bool)
+
+
+def quantize_weights(weights, total):
+    """Round (n, k) weight rows to integers that sum exactly to total
+
+    Uses largest-remainder rounding: every row is scaled to total, floored, and the
+    missing units go to the slots with the largest fractional parts. Rows with no
+    weight stay zero.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    sums = weights.sum(axis=1, keepdims=True)
+    scaled = np.divide(weights * total, sums, out=np.zeros_like(weights), where=sums > 0)
+    
+    floors = np.floor(scaled)
+    remainder = np.where(sums[:, 0] > 0, total - floors.sum(axis=1), 0).astype(np.int64)
+    remainder = np.clip(remainder, 0, weights.shape[1])
+    
+    order = np.argsort(floors - scaled, axis=1, kind="stable")
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.broadcast_to(np.arange(weights.shape[1]), order.shape), axis=1)
+    return (floors + (rank < remainder[:, None])).astype(np.int64)
 
 
 # ==================== DATA & DRAWING ====================
 
-def get_deform_group_names(obj):
-    """Get names of deform bones from armature modifier"""
-    deform_group_names = set()
+class RigBinding:
+    """Armature binding of a mesh object, shared by panel draw, poll and operators
+
+    armature is the first armature modifier's object (None if unbound) and
+    armature_modifiers holds (armature object, use_vertex_groups) for every armature
+    modifier. deform_names are the deform bones of all of them, group_index maps bone
+    name to vertex group index and bone_heads/bone_tails hold rest heads and tails
+    (b, 3) in armature space, in armature.data.bones order. group_bones maps every
+    vertex group index to its bone index (-1 if none); deform_group_bones does the
+    same for deform bones only.
+    """
+    __slots__ = (
+        "armature", "armature_modifiers", "deform_names", "group_index", "bone_names",
+        "bone_heads", "bone_tails", "group_bones", "deform_group_bones", "_ancestors",
+    )
+    
+    def __init__(self, obj):
+        self.armature = None
+        armature_modifiers = []
+        deform_names = set()
+        for mod in obj.modifiers:
+            if mod.type == "ARMATURE" and mod.object and mod.object.type == "ARMATURE":
+                if self.armature is None:
+                    self.armature = mod.object
+                armature_modifiers.append((mod.object, mod.use_vertex_groups))
+                for bone in mod.object.data.bones:
+                    if bone.use_deform:
+                        deform_names.add(bone.name)
+        self.armature_modifiers = tuple(armature_modifiers)
+        self.deform_names = frozenset(deform_names)
+        self._ancestors = None
+        
+        self.bone_names = []
+        self.bone_heads = np.zeros((0, 3), dtype=np.float32)
+        self.bone_tails = np.zeros((0, 3), dtype=np.float32)
+        self.group_index = {}
+        self.group_bones = np.full(max(len(obj.vertex_groups), 1), -1, dtype=np.int64)
+        self.deform_group_bones = self.group_bones
+        if self.armature is not None:
+            bones = self.armature.data.bones
+            self.bone_names = bones.keys()
+            heads = np.empty(len(bones) * 3, dtype=np.float32)
+            tails = np.empty(len(bones) * 3, dtype=np.float32)
+            bones.foreach_get("head_local", heads)
+            bones.foreach_get("tail_local", tails)
+            self.bone_heads = heads.reshape(-1, 3)
+            self.bone_tails = tails.reshape(-1, 3)
+            vgroups = obj.vertex_groups
+            self.group_index = {
+                name: vgroups[name].index for name in self.bone_names if name in vgroups
+            }
+            
+            use_deform = np.zeros(len(bones), dtype=bool)
+            bones.foreach_get("use_deform", use_deform)
+            bone_index = {name: i for i, name in enumerate(self.bone_names)}
+            if len(vgroups):
+                self.group_bones = np.array(
+                    [bone_index.get(vg.name, -1) for vg in vgroups], dtype=np.int64
+                )
+            # Trailing False so -1 (no bone) indexes a non-deform slot
+            deform = np.append(use_deform, False)[self.group_bones]
+            self.deform_group_bones = np.where(deform, self.group_bones, -1)
+    
+    def deform_ancestors(self):
+        """Map non-deform bone names to their nearest deform ancestor (or None)"""
+        if self._ancestors is None:
+            ancestors = {}
+            for armature, _ in self.armature_modifiers:
+                for bone in armature.data.bones:
+                    if bone.use_deform:
+                        continue
+                    parent = bone.parent
+                    while parent and not parent.use_deform:
+                        parent = parent.parent
+                    ancestors.setdefault(bone.name, parent.name if parent else None)
+            self._ancestors = ancestors
+        return self._ancestors
+    
+    def is_valid(self):
+        """False once the cached armature object has been removed"""
+        try:
+            return self.armature is None or self.armature.name is not None
+        except ReferenceError:
+            return False
+
+
+# Rig bindings per object name. Any update to the object, its mesh or the armature
+# data drops them (posing re-evaluates bound meshes too); rebuilding is cheap.
+_rig_binding_cache = ToolkitCache(geometry=False)
+
+
+def get_rig_binding(obj):
+    """Cached RigBinding for obj"""
+    binding = _rig_binding_cache.get(obj.name)
+    if binding is not None and binding.is_valid():
+        return binding
+    
+    binding = RigBinding(obj)
+    depends = [obj.data.name] if obj.data else []
     for mod in obj.modifiers:
         if mod.type == "ARMATURE" and mod.object and mod.object.type == "ARMATURE":
-            for bone in mod.object.data.bones:
-                if bone.use_deform:
-                    deform_group_names.add(bone.name)
-    return deform_group_names
+            depends.append(mod.object.data.name)
+    return _rig_binding_cache.set(obj.name, binding, depends)
+
+
+def get_deform_group_names(obj):
+    """Get names of deform bones from armature modifier"""
+    return get_rig_binding(obj).deform_names
+
+
+# Modifiers that only move vertices: vertex count and vertex groups stay as on obj.data
+DEFORM_ONLY_MODIFIERS = {
+    "ARMATURE", "CAST", "CORRECTIVE_SMOOTH", "CURVE", "DISPLACE", "HOOK",
+    "LAPLACIANDEFORM", "LAPLACIANSMOOTH", "LATTICE", "MESH_DEFORM", "SHRINKWRAP",
+    "SIMPLE_DEFORM", "SMOOTH", "SURFACE_DEFORM", "WARP", "WAVE",
+}
+
+# Weight data read from evaluated meshes, kept until the object's next geometry update
+_evaluated_weights_cache = ToolkitCache(geometry=True)
+
+
+def modifiers_change_weights(obj):
+    """Check if any enabled modifier can change vertex count or vertex groups"""
+    return any(
+        mod.show_viewport and mod.type not in DEFORM_ONLY_MODIFIERS
+        for mod in obj.modifiers
+    )
+
+
+def read_vertex_coords(mesh):
+    """Vertex coordinates as an (n, 3) float32 array"""
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    return coords.reshape(-1, 3)
+
+
+def to_world_coords(obj, coords):
+    """Transform (n, 3) object-space coordinates to a list of world-space tuples"""
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    world = coords @ matrix[:3, :3].T + matrix[:3, 3]
+    return [tuple(co) for co in world.tolist()]
+
+
+def get_scan_weight_data(context, obj):
+    """Return (coords, WeightTable) for weight scans
+
+    Reads obj.data directly when the modifier stack cannot change vertex count or
+    groups; otherwise evaluates the object once and caches the extracted arrays
+    until its next geometry update.
+    """
+    if obj.mode == "EDIT":
+        obj.update_from_editmode()
+    
+    if not modifiers_change_weights(obj):
+        return read_vertex_coords(obj.data), WeightTable.from_mesh(obj.data)
+    
+    cached = _evaluated_weights_cache.get(obj.name)
+    if cached is not None:
+        return cached
+    
+    depsgraph = context.evaluated_depsgraph_get()
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh_eval = obj_eval.to_mesh()
+    try:
+        data = (read_vertex_coords(mesh_eval), WeightTable.from_mesh(mesh_eval))
+    finally:
+        obj_eval.to_mesh_clear()
+    
+    return _evaluated_weights_cache.set(obj.name, data)
 
 
 def get_overlimit_vertices(context, obj, limit, count_deform_only=True):
@@ -28,33 +485,21 @@ def get_overlimit_vertices(context, obj, limit, count_deform_only=True):
     if not obj or obj.type != "MESH":
         return []
     
-    result = []
     deform_names = get_deform_group_names(obj) if count_deform_only else set()
     use_deform_filter = count_deform_only and len(deform_names) > 0
     
-    depsgraph = context.evaluated_depsgraph_get()
-    obj_eval = obj.evaluated_get(depsgraph)
-    mesh_eval = obj_eval.to_mesh()
+    coords, table = get_scan_weight_data(context, obj)
     
-    for i, vert in enumerate(mesh_eval.vertices):
-        if use_deform_filter:
-            # Count only deform groups
-            total_weight = 0
-            for g in vert.groups:
-                if g.weight > 0 and g.group < len(obj.vertex_groups):
-                    group_name = obj.vertex_groups[g.group].name
-                    if group_name in deform_names:
-                        total_weight += g.weight
-        else:
-            # Count all groups
-            total_weight = sum(g.weight for g in vert.groups)
-        
-        if total_weight > limit:
-            co_world = obj.matrix_world @ vert.co
-            result.append((co_world.x, co_world.y, co_world.z))
+    if use_deform_filter:
+        # Count only deform groups
+        deform_mask = get_deform_group_mask(obj, deform_names)
+        known = table.groups < len(deform_mask)
+        keep = np.zeros(len(table.groups), dtype=bool)
+        keep[known] = deform_mask[table.groups[known]]
+        table = table.select(keep & (table.weights > 0))
     
-    obj_eval.to_mesh_clear()
-    return result
+    indices = np.nonzero(table.sums() > limit)[0]
+    return to_world_coords(obj, coords[indices])
 
 
 def get_overgroup_vertices(context, obj, max_groups, count_deform_only=True):
@@ -86,42 +531,450 @@ def get_overgroup_vertices(context, obj, max_groups, count_deform_only=True):
     return result
 
 
-def draw_weight_overlay():
-    """Draw overlay for over-limit and over-group vertices"""
-    context = bpy.context
-    props = context.scene.emesh_toolkit
+def get_unnormalized_vertices(obj, tolerance=0.001):
+    """Get vertices whose deform weights do not sum to 1.0 (unweighted vertices are skipped)"""
+    if not obj or obj.type != "MESH" or not obj.vertex_groups:
+        return []
+    
+    deform_names = get_deform_group_names(obj)
+    if not deform_names:
+        return []
+    
+    deform_mask = get_deform_group_mask(obj, deform_names)
+    table = WeightTable.from_mesh(obj.data)
+    table = table.select(deform_mask[table.groups])
+    sums = table.sums()
+    indices = np.nonzero((sums > 0) & (np.abs(sums - 1.0) > tolerance))[0]
+    return to_world_coords(obj, read_vertex_coords(obj.data)[indices])
+
+
+# Bucket edges for per-vertex deform weight sums (label, upper bound)
+WEIGHT_SUM_BUCKETS = (
+    ("0", 0.0005),
+    ("< 0.5", 0.5),
+    ("< 0.99", 0.99),
+    ("≈ 1.0", 1.01),
+    ("< 1.5", 1.5),
+    ("≥ 1.5", np.inf),
+)
+MAX_INFLUENCE_BUCKET = 8
+
+# Statistics per object name, computed on demand and dropped on geometry updates
+_weight_statistics_cache = ToolkitCache(geometry=True)
+
+
+def compute_weight_statistics(obj):
+    """Compute weight sum / influence histograms and per-bone totals in one pass"""
+    if obj.mode == "EDIT":
+        obj.update_from_editmode()
     
-    # Draw weight limit overlay
-    if props.overlay_weights and props.weight_overlay_data:
-        try:
-            coords = [(item.x, item.y, item.z) for item in props.weight_overlay_data]
-            
-            if coords:
-                shader = gpu.shader.from_builtin("UNIFORM_COLOR")
-                batch = batch_for_shader(shader, "POINTS", {"pos": coords})
-                shader.bind()
-                shader.uniform_float("color", (1.0, 0.0, 0.0, 1.0))
-                gpu.state.point_size_set(8.0)
-                batch.draw(shader)
-                gpu.state.point_size_set(1.0)
-        except:
-            pass
-    
-    # Draw vertex group overlay
-    if props.overlay_vertex_groups and props.vertex_group_overlay_data:
-        try:
-            coords = [(item.x, item.y, item.z) for item in props.vertex_group_overlay_data]
-            
-            if coords:
-                shader = gpu.shader.from_builtin("UNIFORM_COLOR")
-                batch = batch_for_shader(shader, "POINTS", {"pos": coords})
-                shader.bind()
-                shader.uniform_float("color", (1.0, 0.5, 0.0, 1.0))
-                gpu.state.point_size_set(8.0)
-                batch.draw(shader)
-                gpu.state.point_size_set(1.0)
-        except:
-            pass
+    deform_names = get_deform_group_names(obj)
+    table = WeightTable.from_mesh(obj.data)
+    num_groups = len(obj.vertex_groups)
+    
+    if deform_names:
+        deform_mask = get_deform_group_mask(obj, deform_names)
+    else:
+        deform_mask = np.ones(num_groups, dtype=bool)
+    table = table.select(deform_mask[table.groups] & (table.weights > 0))
+    
+    sums = table.sums()
+    counts = table.counts()
+    edges = np.array([upper for _, upper in WEIGHT_SUM_BUCKETS])
+    sum_histogram = np.bincount(np.searchsorted(edges, sums, side="right"), minlength=len(edges))
+    influence_histogram = np.bincount(np.minimum(counts, MAX_INFLUENCE_BUCKET), minlength=MAX_INFLUENCE_BUCKET + 1)
+    
+    group_vertices = np.bincount(table.groups, minlength=num_groups)
+    group_mass = np.bincount(table.groups, weights=table.weights, minlength=num_groups)
+    
+    bones = []
+    for vg in obj.vertex_groups:
+        if deform_mask[vg.index] and group_vertices[vg.index]:
+            bones.append((vg.name, int(group_vertices[vg.index]), float(group_mass[vg.index])))
+    bones.sort(key=lambda b: b[2], reverse=True)
+    
+    used = {name for name, _, _ in bones}
+    zero_influence = sorted((deform_names or {vg.name for vg in obj.vertex_groups}) - used)
+    
+    return {
+        "sums": sums,
+        "counts": counts,
+        "sum_histogram": sum_histogram[:len(WEIGHT_SUM_BUCKETS)].tolist(),
+        "influence_histogram": influence_histogram.tolist(),
+        "bones": bones,
+        "zero_influence": zero_influence,
+    }
+
+
+def get_weight_statistics(obj):
+    """Return cached statistics for obj or None"""
+    return _weight_statistics_cache.get(obj.name) if obj else None
+
+
+def format_bar(value, maximum, width=16):
+    """Render value as a compact text bar"""
+    filled = int(round(width * value / maximum)) if maximum else 0
+    return "█" * filled + "·" * (width - filled)
+
+
+# Bone influence index per armature object: (bound mesh names, {bone: [(object, indices, weights)]}).
+# Depends on mesh and armature *data* so posing (which updates the objects) keeps it.
+_bone_influence_cache = ToolkitCache(geometry=True)
+
+
+# Armature object name -> names of mesh objects bound to it, built in one scan.
+# Any object or collection update (modifier edits, adding, linking) rebuilds it.
+_bound_mesh_cache = ToolkitCache(geometry=False, clear_on=("OBJECT", "COLLECTION"))
+
+
+def get_bound_mesh_index():
+    """Cached map of armature object name to bound mesh object names"""
+    index = _bound_mesh_cache.get(("bound",))
+    if index is not None:
+        return index
+    
+    index = {}
+    for obj in bpy.data.objects:
+        if obj.type != "MESH":
+            continue
+        for target, _ in get_rig_binding(obj).armature_modifiers:
+            names = index.setdefault(target.name, [])
+            if obj.name not in names:
+                names.append(obj.name)
+    return _bound_mesh_cache.set(("bound",), index)
+
+
+def get_bound_meshes(armature):
+    """Mesh objects with an armature modifier pointing to armature"""
+    objects = bpy.data.objects
+    return [
+        objects[name] for name in get_bound_mesh_index().get(armature.name, ())
+        if name in objects
+    ]
+
+
+def get_bone_influence_index(armature):
+    """Map bone name to [(mesh object name, vertex indices, weights)] over all bound meshes"""
+    meshes = get_bound_meshes(armature)
+    names = tuple(sorted(obj.name for obj in meshes))
+    
+    cached = _bone_influence_cache.get(("bones", armature.name))
+    if cached is not None and cached[0] == names:
+        return cached[1]
+    
+    bone_names = set(armature.data.bones.keys())
+    index = {}
+    for obj in meshes:
+        if obj.mode == "EDIT":
+            obj.update_from_editmode()
+        table = WeightTable.from_mesh(obj.data)
+        table = table.select(table.weights > 0)
+        vertex_ids = table.vertex_ids()
+        
+        order = np.argsort(table.groups, kind="stable")
+        groups = table.groups[order]
+        starts = np.searchsorted(groups, np.arange(len(obj.vertex_groups) + 1))
+        for vg in obj.vertex_groups:
+            start, end = starts[vg.index], starts[vg.index + 1]
+            if vg.name in bone_names and end > start:
+                elements = order[start:end]
+                index.setdefault(vg.name, []).append((obj.name, vertex_ids[elements], table.weights[elements]))
+    
+    depends = [obj.data.name for obj in meshes] + [armature.data.name]
+    _bone_influence_cache.set(("bones", armature.name), (names, index), depends=depends)
+    return index
+
+
+def get_active_bone_target(context):
+    """Return (armature object, bone name) for the active bone or weight-paint group"""
+    obj = context.active_object
+    if not obj:
+        return None, None
+    
+    if obj.type == "ARMATURE":
+        bone = context.active_bone
+        return obj, bone.name if bone else None
+    
+    if obj.type == "MESH" and obj.vertex_groups.active:
+        armature = get_rig_binding(obj).armature
+        if armature:
+            return armature, obj.vertex_groups.active.name
+    return None, None
+
+
+def get_armature_object(obj):
+    """First armature object from obj's armature modifiers, or None"""
+    return get_rig_binding(obj).armature
+
+
+def get_armature_segments(armature, pose=False):
+    """Heads/tails of armature bones in armature space as (b, 3) arrays, plus bone names
+
+    Rest pose by default; pose=True uses the current pose-bone heads and tails.
+    Rows follow armature.data.bones order.
+    """
+    bones = armature.data.bones
+    names = bones.keys()
+    heads = np.empty(len(bones) * 3, dtype=np.float32)
+    tails = np.empty(len(bones) * 3, dtype=np.float32)
+    
+    if pose:
+        pose_bones = armature.pose.bones
+        pose_bones.foreach_get("head", heads)
+        pose_bones.foreach_get("tail", tails)
+        pose_order = {pb.name: i for i, pb in enumerate(pose_bones)}
+        order = np.array([pose_order[name] for name in names], dtype=np.int64)
+        return heads.reshape(-1, 3)[order], tails.reshape(-1, 3)[order], names
+    
+    bones.foreach_get("head_local", heads)
+    bones.foreach_get("tail_local", tails)
+    return heads.reshape(-1, 3), tails.reshape(-1, 3), names
+
+
+def segments_to_object(obj, armature, heads, tails):
+    """Transform armature-space heads/tails into obj's local space"""
+    matrix = np.array(obj.matrix_world.inverted() @ armature.matrix_world, dtype=np.float64)
+    heads = heads @ matrix[:3, :3].T + matrix[:3, 3]
+    tails = tails @ matrix[:3, :3].T + matrix[:3, 3]
+    return heads, tails
+
+
+def get_bone_segments(obj, armature, pose=False):
+    """Heads/tails of armature bones in obj's local space as (b, 3) arrays, plus bone names
+
+    Rest pose by default; pose=True uses the current pose-bone heads and tails.
+    Rows follow armature.data.bones order.
+    """
+    binding = get_rig_binding(obj)
+    if not pose and binding.armature == armature:
+        # Rest heads/tails come from the cached rig binding
+        heads, tails, names = binding.bone_heads, binding.bone_tails, binding.bone_names
+    else:
+        heads, tails, names = get_armature_segments(armature, pose)
+    return (*segments_to_object(obj, armature, heads, tails), names)
+
+
+def point_segment_distances(points, heads, tails):
+    """Distance from each point to its matching segment (all arrays (n, 3))"""
+    axis = tails - heads
+    length2 = np.einsum("ij,ij->i", axis, axis)
+    t = np.einsum("ij,ij->i", points - heads, axis)
+    t = np.clip(np.divide(t, length2, out=np.zeros_like(t), where=length2 > 0), 0.0, 1.0)
+    closest = heads + t[:, None] * axis
+    return np.linalg.norm(points - closest, axis=1)
+
+
+def grouped_median(values, groups, num_groups):
+    """Median of values per group id (0 for empty groups)"""
+    order = np.lexsort((values, groups))
+    counts = np.bincount(groups, minlength=num_groups)
+    starts = np.cumsum(counts) - counts
+    medians = np.zeros(num_groups, dtype=np.float64)
+    present = counts > 0
+    medians[present] = values[order][starts[present] + counts[present] // 2]
+    return medians
+
+
+def find_weight_bleed(obj, sigma, min_distance=0.0, min_weight=0.0):
+    """Find deform influences far from their bone compared to that bone's other vertices
+
+    Returns (vertex indices, element distances, element bone names) of flagged influences.
+    An influence is flagged when its vertex-to-bone-segment distance exceeds the bone's
+    median by sigma robust deviations (scaled MAD) and min_distance.
+    """
+    armature = get_armature_object(obj)
+    if not armature:
+        return np.empty(0, dtype=np.int64), np.empty(0), []
+    
+    heads, tails, bone_names = get_bone_segments(obj, armature)
+    bone_of_name = {name: i for i, name in enumerate(bone_names)}
+    deforming = {bone.name for bone in armature.data.bones if bone.use_deform}
+    bone_of_group = np.array(
+        [bone_of_name.get(vg.name, -1) if vg.name in deforming else -1 for vg in obj.vertex_groups] or [-1],
+        dtype=np.int64,
+    )
+    
+    table = WeightTable.from_mesh(obj.data)
+    vertex_ids = table.vertex_ids()
+    bones = bone_of_group[table.groups]
+    keep = (bones >= 0) & (table.weights > min_weight)
+    vertex_ids, bones = vertex_ids[keep], bones[keep]
+    
+    coords = read_vertex_coords(obj.data).astype(np.float64)
+    distances = point_segment_distances(coords[vertex_ids], heads[bones], tails[bones])
+    
+    medians = grouped_median(distances, bones, len(bone_names))
+    deviations = np.abs(distances - medians[bones])
+    mads = grouped_median(deviations, bones, len(bone_names)) * 1.4826
+    
+    flagged = (distances > medians[bones] + sigma * mads[bones]) & (distances > min_distance)
+    return vertex_ids[flagged], distances[flagged], [bone_names[b] for b in bones[flagged].tolist()]
+
+
+def find_weight_discontinuities(obj, threshold, block_size=32):
+    """Find vertices whose deform weights jump by more than threshold across an edge
+
+    Returns (vertex indices, their maximum neighbour difference over all deform groups).
+    """
+    mesh = obj.data
+    deform_names = get_deform_group_names(obj)
+    num_groups = len(obj.vertex_groups)
+    if deform_names:
+        deform_mask = get_deform_group_mask(obj, deform_names)
+    else:
+        deform_mask = np.ones(num_groups, dtype=bool)
+    
+    table = WeightTable.from_mesh(mesh)
+    table = table.select(deform_mask[table.groups])
+    edges, _, _ = get_vertex_adjacency(mesh)
+    
+    edge_max = np.zeros(len(edges), dtype=np.float32)
+    used = np.unique(table.groups)
+    for start in range(0, len(used), block_size):
+        block = dense_group_block(table, used[start:start + block_size], num_groups)
+        diff = np.abs(block[edges[:, 0]] - block[edges[:, 1]]).max(axis=1)
+        np.maximum(edge_max, diff, out=edge_max)
+    
+    vertex_max = np.zeros(table.num_verts, dtype=np.float32)
+    np.maximum.at(vertex_max, edges[:, 0], edge_max)
+    np.maximum.at(vertex_max, edges[:, 1], edge_max)
+    
+    indices = np.nonzero(vertex_max > threshold)[0]
+    return indices, vertex_max[indices]
+
+
+# Transfer sources per mesh datablock name: (triangles, coords, BVHTree, WeightTable), kept
+# until the mesh data changes (posing or renaming the source object does not invalidate them)
+_transfer_source_cache = ToolkitCache(geometry=True)
+
+
+def get_transfer_source(obj):
+    """Build (or reuse) the triangle BVH and weight table of a transfer source"""
+    mesh = obj.data
+    cached = _transfer_source_cache.get(("transfer", mesh.name))
+    if cached is not None:
+        return cached
+    
+    mesh.calc_loop_triangles()
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tris)
+    tris = tris.reshape(-1, 3)
+    coords = read_vertex_coords(mesh)
+    
+    tree = BVHTree.FromPolygons(coords.tolist(), tris.tolist(), all_triangles=True)
+    data = (tris, coords.astype(np.float64), tree, WeightTable.from_mesh(mesh))
+    return _transfer_source_cache.set(("transfer", mesh.name), data, depends=[mesh.name])
+
+
+def barycentric_weights(points, a, b, c):
+    """Barycentric coordinates of points in triangles (a, b, c), all (n, 3) arrays"""
+    v0, v1, v2 = b - a, c - a, points - a
+    d00 = np.einsum("ij,ij->i", v0, v0)
+    d01 = np.einsum("ij,ij->i", v0, v1)
+    d11 = np.einsum("ij,ij->i", v1, v1)
+    d20 = np.einsum("ij,ij->i", v2, v0)
+    d21 = np.einsum("ij,ij->i", v2, v1)
+    denom = d00 * d11 - d01 * d01
+    safe = np.abs(denom) > 1e-20
+    v = np.divide(d11 * d20 - d01 * d21, denom, out=np.zeros_like(denom), where=safe)
+    w = np.divide(d00 * d21 - d01 * d20, denom, out=np.zeros_like(denom), where=safe)
+    bary = np.clip(np.stack((1.0 - v - w, v, w), axis=1), 0.0, 1.0)
+    bary[~safe] = (1.0, 0.0, 0.0)
+    return bary / bary.sum(axis=1, keepdims=True)
+
+
+# ==================== SNAPSHOTS ====================
+
+SNAPSHOT_MAGIC = b"EMESHWT1"
+SNAPSHOT_ALIGN = 64
+
+
+def save_weight_snapshot(path, obj):
+    """Write obj's full weight table and group names to a memory-mappable file
+
+    Layout: magic, uint64 header size, JSON header padded to SNAPSHOT_ALIGN, then the
+    offsets/groups/weights arrays at aligned offsets (relative to the data start)
+    listed in the header.
+    """
+    table = WeightTable.from_mesh(obj.data)
+    arrays = {"offsets": table.offsets, "groups": table.groups, "weights": table.weights}
+    header = {
+        "object": obj.name,
+        "num_verts": table.num_verts,
+        "group_names": [vg.name for vg in obj.vertex_groups],
+        "arrays": {},
+    }
+    
+    position = 0
+    for name, array in arrays.items():
+        position += -position % SNAPSHOT_ALIGN
+        header["arrays"][name] = {"dtype": array.dtype.str, "offset": position, "count": int(array.size)}
+        position += array.nbytes
+    
+    encoded = json.dumps(header).encode("utf-8")
+    header_size = len(encoded) + (-(len(SNAPSHOT_MAGIC) + 8 + len(encoded)) % SNAPSHOT_ALIGN)
+    data_start = len(SNAPSHOT_MAGIC) + 8 + header_size
+    
+    with open(path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(np.uint64(header_size).tobytes())
+        f.write(encoded.ljust(header_size, b" "))
+        for name, array in arrays.items():
+            f.seek(data_start + header["arrays"][name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+    return table
+
+
+def load_weight_snapshot(path):
+    """Memory-map a snapshot file; returns (WeightTable, group names, header)"""
+    with open(path, "rb") as f:
+        if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a weight snapshot: {os.path.basename(path)}")
+        header_size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        header = json.loads(f.read(header_size).decode("utf-8"))
+    data_start = len(SNAPSHOT_MAGIC) + 8 + header_size
+    
+    arrays = {}
+    for name, info in header["arrays"].items():
+        if info["count"]:
+            arrays[name] = np.memmap(path, dtype=np.dtype(info["dtype"]), mode="r",
+                                     offset=data_start + info["offset"], shape=(info["count"],))
+        else:
+            arrays[name] = np.empty(0, dtype=np.dtype(info["dtype"]))
+    
+    table = WeightTable(arrays["offsets"], arrays["groups"], arrays["weights"])
+    return table, header["group_names"], header
+
+
+def diff_weight_tables(table_a, names_a, table_b, names_b, tolerance=0.0):
+    """Compare two weight tables by group name
+
+    Returns (changed vertex indices, their max absolute delta, changed group names).
+    Both tables must describe the same vertex count.
+    """
+    if table_a.num_verts != table_b.num_verts:
+        raise ValueError(f"Vertex count differs ({table_a.num_verts} vs {table_b.num_verts})")
+    
+    union = sorted(set(names_a) | set(names_b))
+    column = {name: i for i, name in enumerate(union)}
+    map_a = np.array([column[n] for n in names_a] or [0], dtype=np.int64)
+    map_b = np.array([column[n] for n in names_b] or [0], dtype=np.int64)
+    
+    # Signed merge: a's weights minus b's weights per (vertex, group)
+    merged = WeightTable.from_elements(
+        table_a.num_verts,
+        np.concatenate((table_a.vertex_ids(), table_b.vertex_ids())),
+        np.concatenate((map_a[np.asarray(table_a.groups)], map_b[np.asarray(table_b.groups)])),
+        np.concatenate((np.asarray(table_a.weights), -np.asarray(table_b.weights))),
+    )
+    delta = np.abs(merged.weights)
+    changed = delta > tolerance
+    
+    vertex_delta = np.zeros(merged.num_verts, dtype=np.float32)
+    np.maximum.at(vertex_delta, merged.vertex_ids()[changed], delta[changed])
+    indices = np.nonzero(vertex_delta > tolerance)[0]
+    groups = [union[g] for g in np.unique(merged.groups[changed]).tolist()]
+    return indices, vertex_delta[indices], groups
 
 
 # ==================== OPERATORS ====================
@@ -144,6 +997,7 @@ class EMESH_OT_ScanWeights(ToolkitOperator):
         for co in overlimit:
             item = props.weight_overlay_data.add()
             item.x, item.y, item.z = co
+        toolkit_overlay.tag_layer("weight_overlay_data")
         
         return self.report_info(f"Found {len(overlimit)} vertices over weight limit")
 
@@ -166,6 +1020,7 @@ class EMESH_OT_ScanVertexGroups(ToolkitOperator):
         for co in overgroup:
             item = props.vertex_group_overlay_data.add()
             item.x, item.y, item.z = co
+        toolkit_overlay.tag_layer("vertex_group_overlay_data")
         
         return self.report_info(f"Found {len(overgroup)} vertices over {props.max_bone_groups} group limit")
 
@@ -296,37 +1151,911 @@ class EMESH_OT_NormalizeWeights(ToolkitOperator):
         return self.report_info(f"Normalized {count} vertices")
 
 
-# ==================== UI ====================
-
-class EMESH_PT_Weights(ToolkitPanel):
-    """Weight tools panel"""
-    bl_label = "Weight Tools"
-    bl_idname = "EMESH_PT_Weights"
-    bl_parent_id = "EMESH_PT_MainPanel"
-    bl_options = {"DEFAULT_CLOSED"}
+class EMESH_OT_QuantizeWeights(ToolkitOperator):
+    """Quantize top deform weights to 8/16-bit integers that sum exactly"""
+    bl_idname = "mesh.emesh_quantize_weights"
+    bl_label = "Quantize Weights"
+    bl_options = {"REGISTER", "UNDO"}
     
-    def draw(self, context):
-        props = context.scene.emesh_toolkit
-        layout = self.layout
-        
-        # ===== WEIGHT LIMIT SECTION =====
-        weight_box = layout.box()
-        weight_box.label(text="Weight Limit Checker", icon="MOD_VERTEX_WEIGHT")
-        
-        settings_row = weight_box.row(align=True)
-        settings_row.prop(props, "weight_limit", text="Limit", slider=True)
-        settings_row.prop(props, "overlay_weights", text="", icon="OVERLAY")
-        
-        action_row = weight_box.row(align=True)
-        action_row.operator("mesh.emesh_scan_weights", text="Scan", icon="VIEWZOOM")
-        
-        # Normalize buttons
+    precision: bpy.props.EnumProperty(
+        name="Precision",
+        items=[
+            ("8", "8-bit", "Weights sum to 255"),
+            ("16", "16-bit", "Weights sum to 65535"),
+        ],
+        default="8"
+    )
+    max_influences: bpy.props.IntProperty(
+        name="Max Influences",
+        default=4,
+        min=1,
+        max=16,
+        description="Number of heaviest deform groups kept per vertex"
+    )
+    write_back: bpy.props.BoolProperty(
+        name="Write Back",
+        default=False,
+        description="Replace deform weights with their quantized values"
+    )
+    selected_only: bpy.props.BoolProperty(
+        name="Selected Only",
+        default=False,
+        description="Only write back selected vertices"
+    )
+    
+    @classmethod
+    def poll(cls, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        return obj and obj.data.vertices
+    
+    def execute(self, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        
+        if not obj:
+            return {"CANCELLED"}
+        
+        deform_group_names = get_deform_group_names(obj)
+        if not deform_group_names:
+            return self.report_warning("No deform groups found")
+        
+        original_mode = obj.mode
+        ToolkitUtils.set_mode(obj, "OBJECT")
+        
+        total = 255 if self.precision == "8" else 65535
+        deform_mask = get_deform_group_mask(obj, deform_group_names)
+        table = WeightTable.from_mesh(obj.data)
+        deform = table.select(deform_mask[table.groups] & (table.weights > 0))
+        
+        groups, weights = deform.top_k(self.max_influences)
+        quantized = quantize_weights(weights, total)
+        
+        weighted = weights.sum(axis=1) > 0
+        truncated = int(np.count_nonzero(deform.counts() > self.max_influences))
+        sums = weights.sum(axis=1, keepdims=True)
+        naive = np.rint(np.divide(weights * total, sums, out=np.zeros_like(weights), where=sums > 0))
+        drifted = int(np.count_nonzero(weighted & (naive.sum(axis=1) != total)))
+        
+        if self.write_back:
+            rows = np.ones(table.num_verts, dtype=bool)
+            if self.selected_only:
+                obj.data.vertices.foreach_get("select", rows)
+            
+            slots = (quantized > 0) & rows[:, None]
+            vertex_ids = np.nonzero(slots)[0]
+            keep_ids = deform.vertex_ids()
+            keep = ~rows[keep_ids]
+            
+            result = WeightTable.from_elements(
+                table.num_verts,
+                np.concatenate((vertex_ids, keep_ids[keep])),
+                np.concatenate((groups[slots], deform.groups[keep])),
+                np.concatenate((quantized[slots] / total, deform.weights[keep])),
+            )
+            write_weight_table(obj, result, np.nonzero(deform_mask)[0])
+        
+        ToolkitUtils.set_mode(obj, original_mode)
+        
+        action = "Wrote" if self.write_back else "Previewed"
+        return self.report_info(
+            f"{action} {int(np.count_nonzero(weighted))} vertices at {self.precision}-bit "
+            f"({truncated} over {self.max_influences} influences, {drifted} would drift with plain rounding)"
+        )
+
+
+class EMESH_OT_WeightStatistics(ToolkitOperator):
+    """Compute weight sum and influence histograms plus per-bone totals"""
+    bl_idname = "mesh.emesh_weight_statistics"
+    bl_label = "Weight Statistics"
+    
+    @classmethod
+    def poll(cls, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        return obj and obj.vertex_groups
+    
+    def execute(self, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        
+        if not obj:
+            return {"CANCELLED"}
+        
+        stats = _weight_statistics_cache.set(obj.name, compute_weight_statistics(obj))
+        return self.report_info(
+            f"{len(stats['bones'])} influencing groups, {len(stats['zero_influence'])} without influence"
+        )
+
+
+class EMESH_OT_SmoothWeights(ToolkitOperator):
+    """Smooth all deform weights over mesh edges (Laplacian) and renormalize"""
+    bl_idname = "mesh.emesh_smooth_weights"
+    bl_label = "Smooth Weights"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    iterations: bpy.props.IntProperty(
+        name="Iterations",
+        default=5,
+        min=1,
+        max=200
+    )
+    factor: bpy.props.FloatProperty(
+        name="Factor",
+        default=0.5,
+        min=0.0,
+        max=1.0,
+        description="Blend toward the neighbour average per iteration"
+    )
+    selected_only: bpy.props.BoolProperty(
+        name="Selected Only",
+        default=True,
+        description="Only smooth selected vertices (others act as fixed boundary)"
+    )
+    normalize: bpy.props.BoolProperty(
+        name="Normalize",
+        default=True,
+        description="Renormalize smoothed deform weights to 1.0"
+    )
+    prune: bpy.props.FloatProperty(
+        name="Prune Below",
+        default=0.001,
+        min=0.0,
+        max=0.1,
+        precision=4,
+        description="Drop smoothed weights below this value"
+    )
+    
+    # Group columns smoothed at once; bounds memory to num_verts * BLOCK floats
+    BLOCK = 32
+    
+    @classmethod
+    def poll(cls, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        return obj and obj.data.vertices and obj.vertex_groups
+    
+    def execute(self, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        
+        if not obj:
+            return {"CANCELLED"}
+        
+        deform_group_names = get_deform_group_names(obj)
+        if not deform_group_names:
+            return self.report_warning("No deform groups found")
+        
+        original_mode = obj.mode
+        ToolkitUtils.set_mode(obj, "OBJECT")
+        
+        mesh = obj.data
+        num_groups = len(obj.vertex_groups)
+        deform_mask = get_deform_group_mask(obj, deform_group_names)
+        table = WeightTable.from_mesh(mesh)
+        table = table.select(deform_mask[table.groups])
+        
+        mask = np.ones(table.num_verts, dtype=bool)
+        if self.selected_only:
+            mesh.vertices.foreach_get("select", mask)
+        if not mask.any():
+            ToolkitUtils.set_mode(obj, original_mode)
+            return self.report_warning("No vertices selected")
+        
+        used = np.unique(table.groups)
+        if not len(used):
+            ToolkitUtils.set_mode(obj, original_mode)
+            return self.report_warning("No weighted deform groups found")
+        
+        _, indptr, indices = get_vertex_adjacency(mesh)
+        vertex_parts, group_parts, weight_parts = [], [], []
+        
+        for start in range(0, len(used), self.BLOCK):
+            columns = used[start:start + self.BLOCK]
+            block = dense_group_block(table, columns, num_groups)
+            
+            for _ in range(self.iterations):
+                target = neighbor_mean(indptr, indices, block)
+                block[mask] += self.factor * (target[mask] - block[mask])
+            
+            rows, cols = np.nonzero((block > self.prune) & mask[:, None])
+            vertex_parts.append(rows)
+            group_parts.append(columns[cols])
+            weight_parts.append(block[rows, cols])
+        
+        vertex_ids = np.concatenate(vertex_parts)
+        weights = np.concatenate(weight_parts)
+        if self.normalize:
+            sums = np.bincount(vertex_ids, weights=weights, minlength=table.num_verts)
+            weights = weights / sums[vertex_ids]
+        
+        # Unmasked vertices keep their original deform elements untouched
+        keep = ~mask[table.vertex_ids()]
+        result = WeightTable.from_elements(
+            table.num_verts,
+            np.concatenate((vertex_ids, table.vertex_ids()[keep])),
+            np.concatenate((np.concatenate(group_parts), table.groups[keep])),
+            np.concatenate((weights, table.weights[keep])),
+        )
+        write_weight_table(obj, result, np.nonzero(deform_mask)[0])
+        
+        ToolkitUtils.set_mode(obj, original_mode)
+        return self.report_info(
+            f"Smoothed {int(np.count_nonzero(mask))} vertices over {len(used)} groups ({self.iterations} iterations)"
+        )
+
+
+class EMESH_OT_MirrorWeights(ToolkitOperator):
+    """Mirror deform weights across local X, pairing .L/.R groups by name"""
+    bl_idname = "mesh.emesh_mirror_weights"
+    bl_label = "Mirror Weights"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    direction: bpy.props.EnumProperty(
+        name="Direction",
+        items=[
+            ("POSITIVE", "+X to -X", "Copy weights from the +X side to the -X side"),
+            ("NEGATIVE", "-X to +X", "Copy weights from the -X side to the +X side"),
+            ("SYMMETRIZE", "Symmetrize", "Average both sides"),
+        ],
+        default="POSITIVE"
+    )
+    tolerance: bpy.props.FloatProperty(
+        name="Tolerance",
+        default=0.001,
+        min=0.0,
+        max=0.1,
+        precision=4,
+        description="Maximum distance to the mirrored vertex position"
+    )
+    create_groups: bpy.props.BoolProperty(
+        name="Create Missing Groups",
+        default=True,
+        description="Create the mirrored vertex group when only one side exists and its bone deforms"
+    )
+    select_unmatched: bpy.props.BoolProperty(
+        name="Select Unmatched",
+        default=False,
+        description="Select vertices without a mirror partner"
+    )
+    
+    @classmethod
+    def poll(cls, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        return obj and obj.data.vertices and obj.vertex_groups
+    
+    def execute(self, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        
+        if not obj:
+            return {"CANCELLED"}
+        
+        original_mode = obj.mode
+        ToolkitUtils.set_mode(obj, "OBJECT")
+        
+        mesh = obj.data
+        group_map = get_mirror_group_map(obj, create=self.create_groups)
+        deform_group_names = get_deform_group_names(obj)
+        if deform_group_names:
+            deform_mask = get_deform_group_mask(obj, deform_group_names | {bpy.utils.flip_name(n) for n in deform_group_names})
+        else:
+            deform_mask = np.ones(len(obj.vertex_groups), dtype=bool)
+        
+        table = WeightTable.from_mesh(mesh)
+        table = table.select(deform_mask[table.groups])
+        mirror = get_mirror_vertex_map(mesh, self.tolerance)
+        x = read_vertex_coords(mesh)[:, 0]
+        
+        center = np.abs(x) <= self.tolerance
+        matched = mirror >= 0
+        if self.direction == "SYMMETRIZE":
+            targets = np.nonzero(matched)[0]
+        else:
+            side = x < -self.tolerance if self.direction == "POSITIVE" else x > self.tolerance
+            targets = np.nonzero(matched & (side | center))[0]
+        
+        is_target = np.zeros(table.num_verts, dtype=bool)
+        is_target[targets] = True
+        blend = np.where(center[targets] | (self.direction == "SYMMETRIZE"), 0.5, 1.0)
+        
+        # Partner weights with flipped groups, plus own weights where averaging
+        elements, positions = table.gather_rows(mirror[targets])
+        own_elements, own_positions = table.gather_rows(targets)
+        own_blend = 1.0 - blend[own_positions]
+        
+        keep = ~is_target[table.vertex_ids()]
+        result = WeightTable.from_elements(
+            table.num_verts,
+            np.concatenate((targets[positions], targets[own_positions], table.vertex_ids()[keep])),
+            np.concatenate((group_map[table.groups[elements]], table.groups[own_elements], table.groups[keep])),
+            np.concatenate((
+                table.weights[elements] * blend[positions],
+                table.weights[own_elements] * own_blend,
+                table.weights[keep],
+            )),
+        )
+        result = result.select(result.weights > 0)
+        write_weight_table(obj, result, np.nonzero(deform_mask)[0])
+        
+        unmatched = int(np.count_nonzero(~matched))
+        if self.select_unmatched:
+            mesh.vertices.foreach_set("select", ~matched)
+        
+        ToolkitUtils.set_mode(obj, original_mode)
+        return self.report_info(f"Mirrored {len(targets)} vertices ({unmatched} without mirror partner)")
+
+
+class EMESH_OT_CleanupVertexGroups(ToolkitOperator):
+    """Remove empty, zero-weight and non-deform vertex groups on selected meshes"""
+    bl_idname = "object.emesh_cleanup_vertex_groups"
+    bl_label = "Clean Up Vertex Groups"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    remove_empty: bpy.props.BoolProperty(
+        name="Empty",
+        default=True,
+        description="Remove groups with no vertices assigned"
+    )
+    remove_zero: bpy.props.BoolProperty(
+        name="Zero Weight",
+        default=True,
+        description="Remove groups whose weights are all below the threshold"
+    )
+    remove_non_deform: bpy.props.BoolProperty(
+        name="Non-Deform",
+        default=False,
+        description="Remove groups not matching a deform bone (objects with an armature only)"
+    )
+    fold_to_ancestor: bpy.props.BoolProperty(
+        name="Fold Into Deform Ancestor",
+        default=True,
+        description="Add weights of non-deform bone groups to their nearest deform parent bone"
+    )
+    threshold: bpy.props.FloatProperty(
+        name="Threshold",
+        default=0.0,
+        min=0.0,
+        max=0.1,
+        precision=4,
+        description="Weights at or below this value count as zero"
+    )
+    
+    @classmethod
+    def poll(cls, context):
+        return any(o.type == "MESH" for o in context.selected_objects) or ToolkitUtils.get_active_mesh_obj(context)
+    
+    def execute(self, context):
+        objs = context.selected_objects if context.selected_objects else [ToolkitUtils.get_active_mesh_obj(context)]
+        objs = [o for o in objs if o and o.type == "MESH" and o.vertex_groups]
+        
+        if not objs:
+            return self.report_warning("No mesh objects with vertex groups selected")
+        
+        active = context.view_layer.objects.active
+        original_mode = active.mode if active else "OBJECT"
+        if active and original_mode != "OBJECT":
+            ToolkitUtils.set_mode(active, "OBJECT")
+        
+        removed_groups = 0
+        folded_groups = 0
+        removed_elements = 0
+        
+        for obj in objs:
+            removed, folded, elements = self.cleanup_object(obj)
+            removed_groups += removed
+            folded_groups += folded
+            removed_elements += elements
+        
+        if active and original_mode != "OBJECT":
+            ToolkitUtils.set_mode(active, original_mode)
+        
+        return self.report_info(
+            f"Removed {removed_groups} groups ({folded_groups} folded) and "
+            f"{removed_elements} weight elements on {len(objs)} objects"
+        )
+    
+    def cleanup_object(self, obj):
+        vgroups = obj.vertex_groups
+        num_groups = len(vgroups)
+        table = WeightTable.from_mesh(obj.data)
+        
+        assigned = np.bincount(table.groups, minlength=num_groups)
+        weighted = np.bincount(table.groups[table.weights > self.threshold], minlength=num_groups)
+        referenced = get_referenced_group_names(obj)
+        deform_names = get_deform_group_names(obj)
+        ancestors = get_deform_ancestor_names(obj) if self.fold_to_ancestor else {}
+        
+        remove = np.zeros(num_groups, dtype=bool)
+        fold_target = np.full(num_groups, -1, dtype=np.int64)
+        
+        # Snapshot the groups: missing ancestor groups are created after the loop
+        fold_names = {}
+        for vg in list(vgroups)[:num_groups]:
+            if vg.name in referenced:
+                continue
+            if self.remove_empty and assigned[vg.index] == 0:
+                remove[vg.index] = True
+            elif self.remove_zero and weighted[vg.index] == 0:
+                remove[vg.index] = True
+            elif self.remove_non_deform and deform_names and vg.name not in deform_names:
+                remove[vg.index] = True
+                ancestor = ancestors.get(vg.name)
+                if ancestor and weighted[vg.index]:
+                    fold_names[vg.index] = ancestor
+        
+        for index, ancestor in fold_names.items():
+            if ancestor not in vgroups:
+                vgroups.new(name=ancestor)
+            fold_target[index] = vgroups[ancestor].index
+        
+        folded = fold_target >= 0
+        if folded.any():
+            # New ancestor groups extend the index range
+            fold_target = np.concatenate((fold_target, np.full(len(vgroups) - num_groups, -1)))
+            targets = np.unique(fold_target[fold_target >= 0])
+            # Fold targets receive weight, so they must survive even if empty or zero now
+            remove[targets[targets < num_groups]] = False
+            sources = fold_target[table.groups]
+            moving = (sources >= 0) & (table.weights > self.threshold)
+            staying = np.isin(table.groups, targets)
+            
+            vertex_ids = table.vertex_ids()
+            merged = WeightTable.from_elements(
+                table.num_verts,
+                np.concatenate((vertex_ids[staying], vertex_ids[moving])),
+                np.concatenate((table.groups[staying], sources[moving])),
+                np.concatenate((table.weights[staying], table.weights[moving])),
+            )
+            write_weight_table(obj, merged, targets)
+        
+        names = [vg.name for vg in vgroups if vg.index < num_groups and remove[vg.index]]
+        for name in names:
+            vgroups.remove(vgroups[name])
+        
+        return len(names), int(np.count_nonzero(folded)), int(assigned[remove].sum())
+
+
+class EMESH_OT_SelectBoneInfluence(ToolkitOperator):
+    """Select vertices influenced by the active bone on every mesh bound to its armature"""
+    bl_idname = "object.emesh_select_bone_influence"
+    bl_label = "Select Bone Influence"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    min_weight: bpy.props.FloatProperty(
+        name="Min Weight",
+        default=0.0,
+        min=0.0,
+        max=1.0,
+        description="Ignore influences at or below this weight"
+    )
+    select: bpy.props.BoolProperty(
+        name="Select",
+        default=True,
+        description="Replace the vertex selection of every bound mesh"
+    )
+    
+    @classmethod
+    def poll(cls, context):
+        armature, bone_name = get_active_bone_target(context)
+        return armature is not None and bone_name is not None
+    
+    def execute(self, context):
+        props = context.scene.emesh_toolkit
+        armature, bone_name = get_active_bone_target(context)
+        
+        if not armature or not bone_name:
+            return self.report_warning("No active bone")
+        
+        influences = get_bone_influence_index(armature).get(bone_name, [])
+        props.bone_influence_overlay_data.clear()
+        
+        total = 0
+        for obj_name, indices, weights in influences:
+            obj = bpy.data.objects[obj_name]
+            indices = indices[weights > self.min_weight]
+            total += len(indices)
+            
+            for co in to_world_coords(obj, read_vertex_coords(obj.data)[indices]):
+                item = props.bone_influence_overlay_data.add()
+                item.x, item.y, item.z = co
+            
+            if self.select:
+                mask = np.zeros(len(obj.data.vertices), dtype=bool)
+                mask[indices] = True
+                ToolkitUtils.set_vertex_selection(obj, mask)
+        toolkit_overlay.tag_layer("bone_influence_overlay_data")
+        
+        return self.report_info(f"'{bone_name}' influences {total} vertices on {len(influences)} meshes")
+
+
+class EMESH_OT_ScanWeightBleed(ToolkitOperator):
+    """Scan for vertices weighted to bones that are far away (statistical outliers per bone)"""
+    bl_idname = "mesh.emesh_scan_weight_bleed"
+    bl_label = "Scan Weight Bleed"
+    
+    min_distance: bpy.props.FloatProperty(
+        name="Min Distance",
+        default=0.02,
+        min=0.0,
+        subtype="DISTANCE",
+        description="Never flag influences closer than this to their bone"
+    )
+    min_weight: bpy.props.FloatProperty(
+        name="Min Weight",
+        default=0.01,
+        min=0.0,
+        max=1.0,
+        description="Ignore influences at or below this weight"
+    )
+    
+    def execute(self, context):
+        props = context.scene.emesh_toolkit
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        
+        if not obj:
+            return self.report_warning("No active mesh object")
+        
+        if not get_armature_object(obj):
+            return self.report_warning("No armature modifier found")
+        
+        if obj.mode == "EDIT":
+            obj.update_from_editmode()
+        
+        vertex_ids, distances, bone_names = find_weight_bleed(
+            obj, props.bleed_sigma, self.min_distance, self.min_weight
+        )
+        
+        # One overlay point per vertex, however many of its influences were flagged
+        indices = np.unique(vertex_ids)
+        coords = to_world_coords(obj, read_vertex_coords(obj.data)[indices])
+        
+        props.bleed_overlay_data.clear()
+        for index, co in zip(indices.tolist(), coords):
+            item = props.bleed_overlay_data.add()
+            item.index = index
+            item.x, item.y, item.z = co
+        toolkit_overlay.tag_layer("bleed_overlay_data")
+        
+        worst = {}
+        for bone_name in bone_names:
+            worst[bone_name] = worst.get(bone_name, 0) + 1
+        top = sorted(worst.items(), key=lambda item: item[1], reverse=True)[:3]
+        details = ", ".join(f"{name} ({count})" for name, count in top)
+        
+        return self.report_info(
+            f"Found {len(bone_names)} bleeding influences on {len(indices)} vertices" +
+            (f": {details}" if details else "")
+        )
+
+
+class EMESH_OT_ScanWeightDiscontinuity(ToolkitOperator):
+    """Scan for weight spikes between neighbouring vertices"""
+    bl_idname = "mesh.emesh_scan_weight_discontinuity"
+    bl_label = "Scan Weight Discontinuity"
+    
+    def execute(self, context):
+        props = context.scene.emesh_toolkit
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        
+        if not obj:
+            return self.report_warning("No active mesh object")
+        
+        if not obj.vertex_groups:
+            return self.report_warning("No vertex groups found")
+        
+        if obj.mode == "EDIT":
+            obj.update_from_editmode()
+        
+        indices, differences = find_weight_discontinuities(obj, props.discontinuity_threshold)
+        coords = to_world_coords(obj, read_vertex_coords(obj.data)[indices])
+        
+        props.discontinuity_overlay_data.clear()
+        for index, co in zip(indices.tolist(), coords):
+            item = props.discontinuity_overlay_data.add()
+            item.index = index
+            item.x, item.y, item.z = co
+        toolkit_overlay.tag_layer("discontinuity_overlay_data")
+        
+        peak = f" (max difference {float(differences.max()):.3f})" if len(differences) else ""
+        return self.report_info(f"Found {len(indices)} vertices with weight spikes{peak}")
+
+
+class EMESH_OT_TransferWeights(ToolkitOperator):
+    """Transfer weights from the active mesh to all other selected meshes (nearest surface point)"""
+    bl_idname = "object.emesh_transfer_weights"
+    bl_label = "Transfer Weights"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    max_distance: bpy.props.FloatProperty(
+        name="Max Distance",
+        default=0.0,
+        min=0.0,
+        subtype="DISTANCE",
+        description="Skip target vertices farther than this from the source (0 = unlimited)"
+    )
+    deform_only: bpy.props.BoolProperty(
+        name="Deform Groups Only",
+        default=True,
+        description="Only transfer groups matching deform bones of the source armature"
+    )
+    normalize: bpy.props.BoolProperty(
+        name="Normalize",
+        default=True,
+        description="Normalize transferred weights to 1.0"
+    )
+    
+    @classmethod
+    def poll(cls, context):
+        source = ToolkitUtils.get_active_mesh_obj(context)
+        return source and source.vertex_groups and any(
+            o.type == "MESH" and o != source for o in context.selected_objects
+        )
+    
+    def execute(self, context):
+        source = ToolkitUtils.get_active_mesh_obj(context)
+        targets = [o for o in context.selected_objects if o.type == "MESH" and o != source]
+        
+        if not source or not targets:
+            return self.report_warning("Select target meshes and make the source active")
+        
+        original_mode = source.mode
+        ToolkitUtils.set_mode(source, "OBJECT")
+        
+        tris, src_coords, tree, table = get_transfer_source(source)
+        if not len(tris):
+            ToolkitUtils.set_mode(source, original_mode)
+            return self.report_warning("Source mesh has no faces")
+        
+        deform_names = get_deform_group_names(source) if self.deform_only else set()
+        names = [vg.name for vg in source.vertex_groups if not deform_names or vg.name in deform_names]
+        
+        source_inverse = source.matrix_world.inverted()
+        total = 0
+        for target in targets:
+            total += self.transfer(source_inverse, tris, src_coords, tree, table, source, target, names)
+        
+        ToolkitUtils.set_mode(source, original_mode)
+        return self.report_info(f"Transferred {len(names)} groups to {total} vertices on {len(targets)} objects")
+    
+    def transfer(self, source_inverse, tris, src_coords, tree, table, source, target, names):
+        mesh = target.data
+        matrix = np.array(source_inverse @ target.matrix_world, dtype=np.float64)
+        points = read_vertex_coords(mesh) @ matrix[:3, :3].T + matrix[:3, 3]
+        
+        # Closest-point queries, one pass over all target vertices
+        max_distance = self.max_distance if self.max_distance > 0 else 1.0e30
+        locations = np.zeros_like(points)
+        faces = np.full(len(points), -1, dtype=np.int64)
+        for i, co in enumerate(points.tolist()):
+            location, _, face, _ = tree.find_nearest(co, max_distance)
+            if face is not None:
+                locations[i] = location
+                faces[i] = face
+        
+        hit = np.nonzero(faces >= 0)[0]
+        corners = tris[faces[hit]]
+        bary = barycentric_weights(
+            locations[hit], src_coords[corners[:, 0]], src_coords[corners[:, 1]], src_coords[corners[:, 2]]
+        )
+        
+        # Source group index -> target group index, creating missing groups
+        group_map = np.full(len(source.vertex_groups), -1, dtype=np.int64)
+        for name in names:
+            vg = target.vertex_groups.get(name) or target.vertex_groups.new(name=name)
+            group_map[source.vertex_groups[name].index] = vg.index
+        
+        vertex_parts, group_parts, weight_parts = [], [], []
+        for corner in range(3):
+            elements, positions = table.gather_rows(corners[:, corner])
+            groups = group_map[table.groups[elements]]
+            valid = groups >= 0
+            vertex_parts.append(hit[positions[valid]])
+            group_parts.append(groups[valid])
+            weight_parts.append(table.weights[elements[valid]] * bary[positions[valid], corner])
+        
+        vertex_ids = np.concatenate(vertex_parts)
+        weights = np.concatenate(weight_parts)
+        if self.normalize and len(vertex_ids):
+            sums = np.bincount(vertex_ids, weights=weights, minlength=len(points))
+            weights = np.divide(weights, sums[vertex_ids], out=np.zeros_like(weights), where=sums[vertex_ids] > 0)
+        
+        # Vertices without a hit keep their current weights in the transferred groups
+        touched = np.unique(group_map[group_map >= 0])
+        current = WeightTable.from_mesh(mesh)
+        is_hit = np.zeros(len(points), dtype=bool)
+        is_hit[hit] = True
+        keep = ~is_hit[current.vertex_ids()] & np.isin(current.groups, touched)
+        
+        result = WeightTable.from_elements(
+            len(points),
+            np.concatenate((vertex_ids, current.vertex_ids()[keep])),
+            np.concatenate((np.concatenate(group_parts), current.groups[keep])),
+            np.concatenate((weights, current.weights[keep])),
+        )
+        write_weight_table(target, result.select(result.weights > 0), touched)
+        return len(hit)
+
+
+class EMESH_OT_SaveWeightSnapshot(ToolkitOperator):
+    """Save the active mesh's weights to a snapshot file"""
+    bl_idname = "mesh.emesh_save_weight_snapshot"
+    bl_label = "Save Weight Snapshot"
+    
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.ewsnap", options={"HIDDEN"})
+    
+    @classmethod
+    def poll(cls, context):
+        return ToolkitUtils.get_active_mesh_obj(context) is not None
+    
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = bpy.path.clean_name(context.active_object.name) + ".ewsnap"
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+    
+    def execute(self, context):
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        
+        if not obj:
+            return {"CANCELLED"}
+        
+        if obj.mode == "EDIT":
+            obj.update_from_editmode()
+        
+        path = bpy.path.ensure_ext(bpy.path.abspath(self.filepath), ".ewsnap")
+        table = save_weight_snapshot(path, obj)
+        return self.report_info(f"Saved {len(table.weights)} weights of {len(obj.vertex_groups)} groups")
+
+
+class EMESH_OT_DiffWeightSnapshot(ToolkitOperator):
+    """Compare a weight snapshot with the live mesh or with a second snapshot"""
+    bl_idname = "mesh.emesh_diff_weight_snapshot"
+    bl_label = "Diff Weight Snapshot"
+    
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    compare_filepath: bpy.props.StringProperty(
+        name="Compare With",
+        subtype="FILE_PATH",
+        description="Second snapshot (empty = live mesh)"
+    )
+    filter_glob: bpy.props.StringProperty(default="*.ewsnap", options={"HIDDEN"})
+    
+    @classmethod
+    def poll(cls, context):
+        return ToolkitUtils.get_active_mesh_obj(context) is not None
+    
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+    
+    def execute(self, context):
+        props = context.scene.emesh_toolkit
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        
+        if not obj:
+            return {"CANCELLED"}
+        
+        if obj.mode == "EDIT":
+            obj.update_from_editmode()
+        
+        try:
+            table_a, names_a, _ = load_weight_snapshot(bpy.path.abspath(self.filepath))
+            if self.compare_filepath:
+                table_b, names_b, _ = load_weight_snapshot(bpy.path.abspath(self.compare_filepath))
+            else:
+                table_b, names_b = WeightTable.from_mesh(obj.data), [vg.name for vg in obj.vertex_groups]
+            indices, deltas, groups = diff_weight_tables(
+                table_a, names_a, table_b, names_b, props.weight_diff_tolerance
+            )
+        except (OSError, ValueError) as e:
+            return self.report_error(str(e))
+        
+        props.weight_diff_overlay_data.clear()
+        if table_a.num_verts == len(obj.data.vertices):
+            for index, co in zip(indices.tolist(), to_world_coords(obj, read_vertex_coords(obj.data)[indices])):
+                item = props.weight_diff_overlay_data.add()
+                item.index = index
+                item.x, item.y, item.z = co
+        toolkit_overlay.tag_layer("weight_diff_overlay_data")
+        
+        peak = float(deltas.max()) if len(deltas) else 0.0
+        names = ", ".join(groups[:5]) + (f" +{len(groups) - 5}" if len(groups) > 5 else "")
+        return self.report_info(
+            f"{len(indices)} vertices changed in {len(groups)} groups, max delta {peak:.4f}" +
+            (f": {names}" if groups else "")
+        )
+
+
+class EMESH_OT_SelectOverlayVertices(ToolkitOperator):
+    """Select the vertices stored in a scan overlay"""
+    bl_idname = "mesh.emesh_select_overlay_vertices"
+    bl_label = "Select Overlay Vertices"
+    bl_options = {"REGISTER", "UNDO"}
+    
+    layer: bpy.props.EnumProperty(
+        name="Layer",
+        items=[
+            ("bleed_overlay_data", "Weight Bleed", "Vertices from the weight bleed scan"),
+            ("discontinuity_overlay_data", "Weight Discontinuity", "Vertices from the weight discontinuity scan"),
+            ("weight_diff_overlay_data", "Weight Diff", "Vertices changed against a weight snapshot"),
+            ("influence_error_overlay_data", "Influence Error", "Vertices with the largest influence-limit error"),
+        ],
+        default="bleed_overlay_data"
+    )
+    
+    def execute(self, context):
+        props = context.scene.emesh_toolkit
+        obj = ToolkitUtils.get_active_mesh_obj(context)
+        
+        if not obj:
+            return {"CANCELLED"}
+        
+        items = getattr(props, self.layer)
+        indices = np.array([item.index for item in items], dtype=np.int64)
+        
+        if not len(indices):
+            return self.report_warning("No vertices found. Scan first.")
+        
+        mask = np.zeros(len(obj.data.vertices), dtype=bool)
+        mask[indices[(indices >= 0) & (indices < len(mask))]] = True
+        
+        ToolkitUtils.set_mode(obj, "EDIT")
+        ToolkitUtils.set_vertex_selection(obj, mask)
+        return self.report_info(f"Selected {int(np.count_nonzero(mask))} vertices")
+
+
+# ==================== UI ====================
+
+class EMESH_PT_Weights(ToolkitPanel):
+    """Weight tools panel"""
+    bl_label = "Weight Tools"
+    bl_idname = "EMESH_PT_Weights"
+    bl_parent_id = "EMESH_PT_MainPanel"
+    bl_options = {"DEFAULT_CLOSED"}
+    
+    def draw(self, context):
+        props = context.scene.emesh_toolkit
+        layout = self.layout
+        
+        # ===== WEIGHT LIMIT SECTION =====
+        weight_box = layout.box()
+        weight_box.label(text="Weight Limit Checker", icon="MOD_VERTEX_WEIGHT")
+        
+        settings_row = weight_box.row(align=True)
+        settings_row.prop(props, "weight_limit", text="Limit", slider=True)
+        settings_row.prop(props, "overlay_weights", text="", icon="OVERLAY")
+        
+        action_row = weight_box.row(align=True)
+        action_row.operator("mesh.emesh_scan_weights", text="Scan", icon="VIEWZOOM")
+        
+        # Normalize buttons
         normalize_row = weight_box.row(align=True)
         op = normalize_row.operator("mesh.emesh_normalize_weights", text="Normalize All", icon="CHECKMARK")
         op.selected_only = False
         op = normalize_row.operator("mesh.emesh_normalize_weights", text="Selected", icon="RESTRICT_SELECT_OFF")
         op.selected_only = True
         
+        # Smooth buttons
+        smooth_row = weight_box.row(align=True)
+        op = smooth_row.operator("mesh.emesh_smooth_weights", text="Smooth All", icon="MOD_SMOOTH")
+        op.selected_only = False
+        op = smooth_row.operator("mesh.emesh_smooth_weights", text="Selected", icon="RESTRICT_SELECT_OFF")
+        op.selected_only = True
+        
+        # Mirror buttons
+        mirror_row = weight_box.row(align=True)
+        for direction, text in (("POSITIVE", "+X → -X"), ("NEGATIVE", "-X → +X"), ("SYMMETRIZE", "Sym")):
+            op = mirror_row.operator("mesh.emesh_mirror_weights", text=text, icon="MOD_MIRROR" if direction == "POSITIVE" else "NONE")
+            op.direction = direction
+        
+        # Transfer button
+        weight_box.operator("object.emesh_transfer_weights", text="Transfer to Selected", icon="MOD_DATA_TRANSFER")
+        
+        # Cleanup button
+        weight_box.operator("object.emesh_cleanup_vertex_groups", text="Clean Up Groups", icon="TRASH")
+        
+        # Quantize buttons
+        quantize_row = weight_box.row(align=True)
+        for precision in ("8", "16"):
+            op = quantize_row.operator("mesh.emesh_quantize_weights", text=f"Quantize {precision}-bit", icon="LINENUMBERS_ON")
+            op.precision = precision
+            op.max_influences = props.max_bone_groups
+        
         if props.weight_overlay_data:
             result_box = weight_box.box()
             result_box.label(text=f"Over-Limit: {len(props.weight_overlay_data)}", icon="ERROR")
@@ -347,6 +2076,109 @@ class EMESH_PT_Weights(ToolkitPanel):
             result_box2 = group_box.box()
             result_box2.label(text=f"Over-Group: {len(props.vertex_group_overlay_data)}", icon="ERROR")
             result_box2.operator("mesh.emesh_select_overgroup_vertices", text="Select Over-Group", icon="RESTRICT_SELECT_OFF")
+        
+        # ===== WEIGHT BLEED SECTION =====
+        bleed_box = layout.box()
+        bleed_box.label(text="Weight Bleed Detector", icon="CON_DISTLIMIT")
+        
+        bleed_row = bleed_box.row(align=True)
+        bleed_row.prop(props, "bleed_sigma", text="Sigma", slider=True)
+        bleed_row.prop(props, "overlay_weight_bleed", text="", icon="OVERLAY")
+        bleed_box.operator("mesh.emesh_scan_weight_bleed", text="Scan", icon="VIEWZOOM")
+        
+        if props.bleed_overlay_data:
+            result_box3 = bleed_box.box()
+            result_box3.label(text=f"Bleeding: {len(props.bleed_overlay_data)}", icon="ERROR")
+            op = result_box3.operator("mesh.emesh_select_overlay_vertices", text="Select Bleeding", icon="RESTRICT_SELECT_OFF")
+            op.layer = "bleed_overlay_data"
+        
+        # ===== DISCONTINUITY SECTION =====
+        spike_box = layout.box()
+        spike_box.label(text="Weight Discontinuity", icon="IPO_ELASTIC")
+        
+        spike_row = spike_box.row(align=True)
+        spike_row.prop(props, "discontinuity_threshold", text="Max Diff", slider=True)
+        spike_row.prop(props, "overlay_weight_discontinuity", text="", icon="OVERLAY")
+        spike_box.operator("mesh.emesh_scan_weight_discontinuity", text="Scan", icon="VIEWZOOM")
+        
+        if props.discontinuity_overlay_data:
+            result_box4 = spike_box.box()
+            result_box4.label(text=f"Spikes: {len(props.discontinuity_overlay_data)}", icon="ERROR")
+            op = result_box4.operator("mesh.emesh_select_overlay_vertices", text="Select Spikes", icon="RESTRICT_SELECT_OFF")
+            op.layer = "discontinuity_overlay_data"
+        
+        # ===== BONE INFLUENCE SECTION =====
+        bone_box = layout.box()
+        bone_box.label(text="Bone Influence", icon="BONE_DATA")
+        
+        armature, bone_name = get_active_bone_target(context)
+        if bone_name:
+            bone_box.label(text=f"{armature.name}: {bone_name}", icon="ARMATURE_DATA")
+        else:
+            bone_box.label(text="Select a bone or vertex group", icon="INFO")
+        
+        bone_row = bone_box.row(align=True)
+        bone_row.operator("object.emesh_select_bone_influence", text="Select Influenced", icon="RESTRICT_SELECT_OFF")
+        bone_row.prop(props, "overlay_bone_influence", text="", icon="OVERLAY")
+        if props.bone_influence_overlay_data:
+            bone_box.label(text=f"Influenced: {len(props.bone_influence_overlay_data)}", icon="VERTEXSEL")
+        
+        # ===== SNAPSHOT SECTION =====
+        snap_box = layout.box()
+        snap_box.label(text="Weight Snapshots", icon="FILE_CACHE")
+        
+        snap_row = snap_box.row(align=True)
+        snap_row.operator("mesh.emesh_save_weight_snapshot", text="Save", icon="FILE_TICK")
+        snap_row.operator("mesh.emesh_diff_weight_snapshot", text="Diff", icon="ARROW_LEFTRIGHT")
+        snap_row.prop(props, "overlay_weight_diff", text="", icon="OVERLAY")
+        snap_box.prop(props, "weight_diff_tolerance", text="Tolerance")
+        
+        if props.weight_diff_overlay_data:
+            result_box5 = snap_box.box()
+            result_box5.label(text=f"Changed: {len(props.weight_diff_overlay_data)}", icon="ERROR")
+            op = result_box5.operator("mesh.emesh_select_overlay_vertices", text="Select Changed", icon="RESTRICT_SELECT_OFF")
+            op.layer = "weight_diff_overlay_data"
+        
+        # ===== STATISTICS SECTION =====
+        stats_box = layout.box()
+        stats_box.label(text="Weight Statistics", icon="SORTSIZE")
+        stats_box.operator("mesh.emesh_weight_statistics", text="Compute", icon="FILE_REFRESH")
+        
+        stats = get_weight_statistics(ToolkitUtils.get_active_mesh_obj(context))
+        if stats:
+            self.draw_statistics(stats_box, props, stats)
+    
+    def draw_statistics(self, layout, props, stats):
+        col = layout.column(align=True)
+        over_limit = int(np.count_nonzero(stats["sums"] > props.weight_limit))
+        col.label(text=f"Weight Sums (over {props.weight_limit:.2f}: {over_limit})")
+        peak = max(stats["sum_histogram"])
+        for (label, _), value in zip(WEIGHT_SUM_BUCKETS, stats["sum_histogram"]):
+            col.label(text=f"{label:>7} {format_bar(value, peak)} {value}")
+        
+        col = layout.column(align=True)
+        over_groups = int(np.count_nonzero(stats["counts"] > props.max_bone_groups))
+        col.label(text=f"Influences (over {props.max_bone_groups}: {over_groups})")
+        peak = max(stats["influence_histogram"])
+        for count, value in enumerate(stats["influence_histogram"]):
+            label = f"{count}+" if count == MAX_INFLUENCE_BUCKET else str(count)
+            icon = "ERROR" if count > props.max_bone_groups and value else "NONE"
+            col.label(text=f"{label:>3} {format_bar(value, peak)} {value}", icon=icon)
+        
+        col = layout.column(align=True)
+        col.label(text=f"Bones by Weight Mass ({len(stats['bones'])})")
+        if stats["bones"]:
+            peak = stats["bones"][0][2]
+            for name, vertices, mass in stats["bones"][:12]:
+                col.label(text=f"{format_bar(mass, peak, 10)} {name}: {vertices} v, {mass:.1f}")
+        
+        if stats["zero_influence"]:
+            col = layout.column(align=True)
+            col.label(text=f"Zero Influence ({len(stats['zero_influence'])})", icon="ERROR")
+            for name in stats["zero_influence"][:12]:
+                col.label(text=name, icon="BONE_DATA")
+            if len(stats["zero_influence"]) > 12:
+                col.label(text=f"... {len(stats['zero_influence']) - 12} more")
 
 
 # ==================== REGISTRATION ====================
@@ -357,28 +2189,43 @@ classes = (
     EMESH_OT_SelectOverlimitWeights,
     EMESH_OT_SelectOvergroupVertices,
     EMESH_OT_NormalizeWeights,
+    EMESH_OT_QuantizeWeights,
+    EMESH_OT_SmoothWeights,
+    EMESH_OT_MirrorWeights,
+    EMESH_OT_CleanupVertexGroups,
+    EMESH_OT_SelectBoneInfluence,
+    EMESH_OT_ScanWeightBleed,
+    EMESH_OT_ScanWeightDiscontinuity,
+    EMESH_OT_TransferWeights,
+    EMESH_OT_SaveWeightSnapshot,
+    EMESH_OT_DiffWeightSnapshot,
+    EMESH_OT_SelectOverlayVertices,
+    EMESH_OT_WeightStatistics,
     EMESH_PT_Weights,
 )
 
-_draw_handler = None
+# (collection, toggle, color, point size), drawn in this order
+OVERLAY_LAYERS = (
+    ("weight_overlay_data", "overlay_weights", (1.0, 0.0, 0.0, 1.0), 8.0),
+    ("bone_influence_overlay_data", "overlay_bone_influence", (0.0, 0.8, 1.0, 1.0), 6.0),
+    ("bleed_overlay_data", "overlay_weight_bleed", (1.0, 0.0, 1.0, 1.0), 8.0),
+    ("discontinuity_overlay_data", "overlay_weight_discontinuity", (0.3, 1.0, 0.2, 1.0), 8.0),
+    ("weight_diff_overlay_data", "overlay_weight_diff", (0.2, 0.4, 1.0, 1.0), 8.0),
+    ("vertex_group_overlay_data", "overlay_vertex_groups", (1.0, 0.5, 0.0, 1.0), 8.0),
+)
 
 
 def register():
-    global _draw_handler
-    
     for cls in classes:
         bpy.utils.register_class(cls)
+    
+    for source, toggle, color, point_size in OVERLAY_LAYERS:
+        toolkit_overlay.register_layer(source, color, point_size, toggle, source=source)
 
 
 def unregister():
-    global _draw_handler
+    for source, _, _, _ in OVERLAY_LAYERS:
+        toolkit_overlay.unregister_layer(source)
     
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
-    
-    if _draw_handler:
-        try:
-            bpy.types.SpaceView3D.draw_handler_remove(_draw_handler, "WINDOW")
-        except:
-            pass
-        _draw_handler = None
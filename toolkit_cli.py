@@ -0,0 +1,238 @@
+"""
+Emil's Mesh Toolkit - Headless Audit CLI
+Batch weight and shapekey checks over a folder of .blend files
+
+Usage:
+    blender -b -P toolkit_cli.py -- <folder> [--jobs 4] [--json report.json] [--csv report.csv]
+                                            [--weight-limit 1.0] [--max-groups 4] [--tolerance 0.001]
+
+The controller fans every .blend file under <folder> out to a pool of background
+Blender processes. Each worker opens one file, runs the checks from mod_weights and
+mod_shapekeys on every mesh object and writes its results to a temporary JSON file;
+the controller merges them into one report with timing per file.
+"""
+
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+
+
+PACKAGE_NAME = "emesh_toolkit"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CSV_FIELDS = (
+    "file",
+    "object",
+    "vertices",
+    "over_limit",
+    "over_groups",
+    "unnormalized",
+    "useless_shapekeys",
+    "seconds",
+    "error",
+)
+
+
+# ==================== ARGUMENTS ====================
+
+def parse_args(argv):
+    """Parse the arguments given after Blender's '--' separator"""
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = []
+
+    parser = argparse.ArgumentParser(prog="blender -b -P toolkit_cli.py --")
+    parser.add_argument("folder", nargs="?", help="Folder searched recursively for .blend files")
+    parser.add_argument("--jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Number of Blender worker processes")
+    parser.add_argument("--json", dest="json_path", default="", help="Write the merged report as JSON")
+    parser.add_argument("--csv", dest="csv_path", default="", help="Write one CSV row per object")
+    parser.add_argument("--weight-limit", type=float, default=1.0, help="Maximum total deform weight per vertex")
+    parser.add_argument("--max-groups", type=int, default=4, help="Maximum deform groups per vertex")
+    parser.add_argument("--tolerance", type=float, default=0.001,
+                        help="Tolerance for useless shapekeys and normalization")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds before a worker is killed")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--out", default="", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+# ==================== WORKER ====================
+
+def load_toolkit_modules():
+    """Import mod_weights and mod_shapekeys without registering the add-on"""
+    if PACKAGE_NAME not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            PACKAGE_NAME,
+            os.path.join(PACKAGE_DIR, "__init__.py"),
+            submodule_search_locations=[PACKAGE_DIR],
+        )
+        sys.modules[PACKAGE_NAME] = importlib.util.module_from_spec(spec)
+
+    mod_weights = importlib.import_module(f"{PACKAGE_NAME}.mod_weights")
+    mod_shapekeys = importlib.import_module(f"{PACKAGE_NAME}.mod_shapekeys")
+    return mod_weights, mod_shapekeys
+
+
+def audit_object(context, obj, args, mod_weights, mod_shapekeys):
+    """Run every check on one mesh object"""
+    start = time.perf_counter()
+    result = {"object": obj.name, "vertices": len(obj.data.vertices)}
+
+    try:
+        result["over_limit"] = len(mod_weights.get_overlimit_vertices(context, obj, args.weight_limit))
+        result["over_groups"] = len(mod_weights.get_overgroup_vertices(context, obj, args.max_groups))
+        result["unnormalized"] = len(mod_weights.get_unnormalized_vertices(obj, args.tolerance))
+        result["useless_shapekeys"] = mod_shapekeys.find_useless_shapekeys(obj, args.tolerance)
+    except Exception as e:
+        result["error"] = str(e)
+
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def run_worker(args):
+    """Audit the currently loaded .blend file and write results to args.out"""
+    mod_weights, mod_shapekeys = load_toolkit_modules()
+    context = bpy.context
+
+    start = time.perf_counter()
+    objects = [
+        audit_object(context, obj, args, mod_weights, mod_shapekeys)
+        for obj in bpy.data.objects
+        if obj.type == "MESH"
+    ]
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"objects": objects, "seconds": round(time.perf_counter() - start, 4)}, f)
+
+
+# ==================== CONTROLLER ====================
+
+def find_blend_files(folder):
+    """Collect .blend files below folder, sorted for stable reports"""
+    paths = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.lower().endswith(".blend"):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def audit_file(index, path, args, tmp_dir):
+    """Run one background Blender worker on path and collect its results"""
+    out_path = os.path.join(tmp_dir, f"{index}.json")
+    command = [
+        bpy.app.binary_path, "-b", "--factory-startup", path,
+        "-P", os.path.abspath(__file__), "--",
+        "--worker", "--out", out_path,
+        "--weight-limit", str(args.weight_limit),
+        "--max-groups", str(args.max_groups),
+        "--tolerance", str(args.tolerance),
+    ]
+
+    start = time.perf_counter()
+    entry = {"file": path, "objects": [], "error": ""}
+    try:
+        proc = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout)
+        entry["returncode"] = proc.returncode
+        if os.path.exists(out_path):
+            with open(out_path, encoding="utf-8") as f:
+                data = json.load(f)
+            entry["objects"] = data["objects"]
+            entry["audit_seconds"] = data["seconds"]
+        else:
+            entry["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "Worker produced no report"
+    except subprocess.TimeoutExpired:
+        entry["returncode"] = None
+        entry["error"] = f"Timed out after {args.timeout:.0f}s"
+
+    entry["seconds"] = round(time.perf_counter() - start, 4)
+    return entry
+
+
+def write_csv(path, files):
+    """Write one row per audited object (or per failed file)"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for entry in files:
+            if not entry["objects"]:
+                writer.writerow({"file": entry["file"], "seconds": entry["seconds"], "error": entry["error"]})
+            for obj in entry["objects"]:
+                writer.writerow({
+                    "file": entry["file"],
+                    "object": obj["object"],
+                    "vertices": obj["vertices"],
+                    "over_limit": obj.get("over_limit", ""),
+                    "over_groups": obj.get("over_groups", ""),
+                    "unnormalized": obj.get("unnormalized", ""),
+                    "useless_shapekeys": len(obj.get("useless_shapekeys", [])),
+                    "seconds": obj["seconds"],
+                    "error": obj.get("error", entry["error"]),
+                })
+
+
+def run_controller(args):
+    """Audit every file in args.folder in parallel and merge the reports"""
+    if not args.folder or not os.path.isdir(args.folder):
+        print(f"Folder not found: {args.folder}")
+        return 1
+
+    paths = find_blend_files(args.folder)
+    print(f"Auditing {len(paths)} files with {args.jobs} workers")
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="emesh_audit_") as tmp_dir:
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            files = list(pool.map(lambda item: audit_file(*item, args, tmp_dir), enumerate(paths)))
+
+    for entry in files:
+        status = entry["error"] or f"{len(entry['objects'])} meshes"
+        print(f"  {entry['seconds']:8.2f}s  {entry['file']}  ({status})")
+
+    report = {
+        "settings": {
+            "weight_limit": args.weight_limit,
+            "max_groups": args.max_groups,
+            "tolerance": args.tolerance,
+        },
+        "seconds": round(time.perf_counter() - start, 4),
+        "files": files,
+    }
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.csv_path:
+        write_csv(args.csv_path, files)
+
+    failed = sum(1 for entry in files if entry["error"])
+    print(f"Audited {len(files)} files in {report['seconds']:.2f}s ({failed} failed)")
+    return 1 if failed else 0
+
+
+def main():
+    args = parse_args(sys.argv)
+    if args.worker:
+        run_worker(args)
+        return
+
+    code = run_controller(args)
+    sys.stdout.flush()
+    if code:
+        sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Shared base classes and utility functions to avoid code duplication
 """
 
 import bpy
+import numpy as np
 
 
 class ToolkitUtils:
@@ -41,6 +42,35 @@ class ToolkitUtils:
         if obj.mode != mode.upper():
             bpy.ops.object.mode_set(mode=mode.upper())
     
+    @staticmethod
+    def set_vertex_selection(obj, mask):
+        """Replace a mesh's vertex selection with a boolean array (object or edit mode)"""
+        mesh = obj.data
+        mask = np.asarray(mask, dtype=bool)
+        
+        if obj.mode == "EDIT":
+            import bmesh
+            bm = bmesh.from_edit_mesh(mesh)
+            for v, selected in zip(bm.verts, mask.tolist()):
+                v.select = selected
+            bm.select_flush_mode()
+            bmesh.update_edit_mesh(mesh)
+            return
+        
+        mesh.vertices.foreach_set("select", mask)
+        
+        edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edges)
+        mesh.edges.foreach_set("select", mask[edges].reshape(-1, 2).all(axis=1))
+        
+        if len(mesh.polygons):
+            loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+            mesh.loops.foreach_get("vertex_index", loop_verts)
+            loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+            mesh.polygons.foreach_get("loop_start", loop_starts)
+            mesh.polygons.foreach_set("select", np.logical_and.reduceat(mask[loop_verts], loop_starts))
+        mesh.update()
+    
     @staticmethod
     def select_vertex_in_edit_mode(obj, vertex_index):
         """Select a vertex in edit mode"""
@@ -50,6 +80,84 @@ class ToolkitUtils:
         ToolkitUtils.set_mode(obj, "EDIT")
 
 
+class ToolkitCache:
+    """Keyed result cache invalidated from the depsgraph update handler
+
+    Entries are dropped when a datablock they depend on (by name) receives a
+    matching depsgraph update. geometry/transform pick which updates count (both
+    False means any update); an update to an ID type in clear_on empties the cache.
+    With track_updates=False entries are only dropped on file load, for data the
+    caller validates itself.
+    """
+    _instances = []
+    
+    def __init__(self, geometry=True, transform=False, clear_on=(), track_updates=True):
+        self.track_updates = track_updates
+        self.geometry = geometry
+        self.transform = transform
+        self.clear_on = set(clear_on)
+        self.entries = {}
+        self.dependents = {}
+        ToolkitCache._instances.append(self)
+    
+    def get(self, key, default=None):
+        """Return cached value or default"""
+        return self.entries.get(key, default)
+    
+    def set(self, key, value, depends=()):
+        """Store value, invalidated by updates to key (if a name) or any name in depends"""
+        self.entries[key] = value
+        names = set(depends)
+        if isinstance(key, str):
+            names.add(key)
+        for name in names:
+            self.dependents.setdefault(name, set()).add(key)
+        return value
+    
+    def invalidate(self, name):
+        """Drop every entry depending on the named datablock"""
+        for key in self.dependents.pop(name, ()):
+            self.entries.pop(key, None)
+    
+    def clear(self):
+        """Drop all entries"""
+        self.entries.clear()
+        self.dependents.clear()
+    
+    def handle_update(self, update):
+        """Apply one DepsgraphUpdate to this cache"""
+        id_data = update.id
+        if id_data.id_type in self.clear_on:
+            self.clear()
+            return
+        
+        if not self.geometry and not self.transform:
+            matches = True
+        else:
+            matches = (
+                (self.geometry and update.is_updated_geometry) or
+                (self.transform and update.is_updated_transform)
+            )
+        if matches:
+            self.invalidate(id_data.name)
+    
+    @classmethod
+    def on_depsgraph_update(cls, depsgraph):
+        """Forward all depsgraph updates to every cache"""
+        caches = [cache for cache in cls._instances if cache.entries and cache.track_updates]
+        if not caches:
+            return
+        for update in depsgraph.updates:
+            for cache in caches:
+                cache.handle_update(update)
+    
+    @classmethod
+    def clear_all(cls):
+        """Drop every cached entry (file load, unregister)"""
+        for cache in cls._instances:
+            cache.clear()
+
+
 class ToolkitOperator(bpy.types.Operator):
     """Base operator class with common helper methods"""
     
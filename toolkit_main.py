@@ -17,15 +17,16 @@ bl_info = {
 }
 
 import bpy
-import gpu
-from gpu_extras.batch import batch_for_shader
-from mathutils import Vector
+import numpy as np
+from bpy.app.handlers import persistent
 
 # Import modules
 if "bpy" in locals():
     import importlib
     if "toolkit_common" in locals():
         importlib.reload(toolkit_common)
+    if "toolkit_overlay" in locals():
+        importlib.reload(toolkit_overlay)
     if "mod_shapekeys" in locals():
         importlib.reload(mod_shapekeys)
     if "mod_weights" in locals():
@@ -36,6 +37,7 @@ if "bpy" in locals():
         importlib.reload(mod_selection)
 
 from . import toolkit_common
+from . import toolkit_overlay
 from . import mod_shapekeys
 from . import mod_weights
 from . import mod_rigging
@@ -84,6 +86,7 @@ class EMESH_VertexItem(bpy.types.PropertyGroup):
 
 class EMESH_CoordItem(bpy.types.PropertyGroup):
     """Simple 3D coordinate storage"""
+    index: bpy.props.IntProperty(default=-1)
     x: bpy.props.FloatProperty()
     y: bpy.props.FloatProperty()
     z: bpy.props.FloatProperty()
@@ -169,76 +172,152 @@ class EMESH_ToolkitProperties(bpy.types.PropertyGroup):
         description="Maximum deform groups per vertex (default 4 for Unity)",
         update=update_max_bone_groups
     )
+    # Rigging properties
+    snap_space: bpy.props.EnumProperty(
+        name="Space",
+        items=[
+            ("REST", "Rest", "Use rest-pose bone positions"),
+            ("POSE", "Pose", "Use current pose bone positions"),
+        ],
+        default="REST"
+    )
+    snap_target: bpy.props.EnumProperty(
+        name="Target",
+        items=[
+            ("HEAD", "Head", "Snap to the bone head"),
+            ("TAIL", "Tail", "Snap to the bone tail"),
+            ("CLOSEST", "Closest", "Snap to the closest point on the head-tail segment"),
+        ],
+        default="HEAD"
+    )
+    snap_all_selected: bpy.props.BoolProperty(
+        name="All Selected Meshes",
+        default=False,
+        description="Snap on every selected mesh bound to the active mesh's armature"
+    )
+    # Selection properties
+    spatial_shape: bpy.props.EnumProperty(
+        name="Shape",
+        items=[
+            ("RADIUS", "Radius", "Objects whose bounds touch a sphere around the active object's center"),
+            ("BOX", "Box", "Objects whose bounds overlap the active object's bounds grown by the distance"),
+        ],
+        default="RADIUS"
+    )
+    spatial_distance: bpy.props.FloatProperty(
+        name="Distance",
+        default=1.0,
+        min=0.0,
+        subtype="DISTANCE",
+        description="Sphere radius or box margin"
+    )
+    
     weight_overlay_data: bpy.props.CollectionProperty(type=EMESH_CoordItem)
     vertex_group_overlay_data: bpy.props.CollectionProperty(type=EMESH_CoordItem)
+    overlay_bone_influence: bpy.props.BoolProperty(
+        name="Show Bone Influence Overlay",
+        default=False,
+        description="Display vertices influenced by the active bone (cyan)"
+    )
+    bone_influence_overlay_data: bpy.props.CollectionProperty(type=EMESH_CoordItem)
+    overlay_weight_bleed: bpy.props.BoolProperty(
+        name="Show Weight Bleed Overlay",
+        default=False,
+        description="Display vertices weighted to distant bones (magenta)"
+    )
+    bleed_sigma: bpy.props.FloatProperty(
+        name="Outlier Sigma",
+        default=3.5,
+        min=1.0,
+        max=20.0,
+        description="Robust deviations above a bone's median distance before an influence is flagged"
+    )
+    bleed_overlay_data: bpy.props.CollectionProperty(type=EMESH_CoordItem)
+    overlay_weight_discontinuity: bpy.props.BoolProperty(
+        name="Show Weight Discontinuity Overlay",
+        default=False,
+        description="Display vertices with weight spikes against their neighbours (green)"
+    )
+    discontinuity_threshold: bpy.props.FloatProperty(
+        name="Max Neighbour Difference",
+        default=0.5,
+        min=0.01,
+        max=1.0,
+        description="Flag vertices whose weight in any deform group differs from a neighbour by more than this"
+    )
+    discontinuity_overlay_data: bpy.props.CollectionProperty(type=EMESH_CoordItem)
+    overlay_weight_diff: bpy.props.BoolProperty(
+        name="Show Weight Diff Overlay",
+        default=False,
+        description="Display vertices whose weights changed against a snapshot (blue)"
+    )
+    weight_diff_tolerance: bpy.props.FloatProperty(
+        name="Diff Tolerance",
+        default=0.001,
+        min=0.0,
+        max=0.5,
+        precision=4,
+        description="Ignore weight changes smaller than this"
+    )
+    weight_diff_overlay_data: bpy.props.CollectionProperty(type=EMESH_CoordItem)
+    overlay_influence_error: bpy.props.BoolProperty(
+        name="Show Influence Error Overlay",
+        default=False,
+        description="Display vertices that deform worst when limited to Max Bone Groups (white)"
+    )
+    influence_error_overlay_data: bpy.props.CollectionProperty(type=EMESH_CoordItem)
 
 
 # ==================== OVERLAY DRAWING ====================
 
-def draw_shapekey_overlay():
-    """Draw overlay for shapekey vertex editor"""
-    context = bpy.context
+# Inputs the shapekey layers were last built from
+_shapekey_overlay_state = None
+
+
+def sync_shapekey_overlay(context, layer):
+    """Rebuild the shapekey overlay layers when the vertex list, selection or display limit changes"""
+    global _shapekey_overlay_state
     props = context.scene.emesh_toolkit
+    obj = toolkit_common.ToolkitUtils.get_active_mesh_obj(context)
+    unselected_layer = toolkit_overlay.get_layer("shapekey")
+    selected_layer = toolkit_overlay.get_layer("shapekey_selected")
     
-    if not props.overlay_shapekey:
+    if not obj or not props.vertex_list:
+        if _shapekey_overlay_state is not None:
+            _shapekey_overlay_state = None
+            unselected_layer.set_points(())
+            selected_layer.set_points(())
         return
     
-    obj = toolkit_common.ToolkitUtils.get_active_mesh_obj(context)
-    if not obj or not props.vertex_list:
+    # Points are stored in object space; the object's matrix is applied at draw time
+    unselected_layer.matrix = selected_layer.matrix = obj.matrix_world.copy()
+    
+    state = (
+        obj.name, len(props.vertex_list), props.selected_vertices,
+        props.limit_display, props.max_display_vertices,
+    )
+    if state == _shapekey_overlay_state and not unselected_layer.stale and not selected_layer.stale:
         return
+    _shapekey_overlay_state = state
     
-    try:
-        selected = toolkit_common.ToolkitUtils.parse_vertex_indices(props.selected_vertices)
-        
-        # Build vertex data from props.vertex_list
-        vertex_data = []
-        for item in props.vertex_list:
-            co_world = obj.matrix_world @ Vector((item.x, item.y, item.z))
-            vertex_data.append({
-                "index": item.index,
-                "co": co_world,
-                "distance": item.distance,
-                "is_selected": item.index in selected
-            })
-        
-        # Sort by distance and limit display
-        vertex_data.sort(key=lambda v: v["distance"], reverse=True)
-        
-        if props.limit_display:
-            vertex_data = vertex_data[:props.max_display_vertices]
-        
-        # Separate selected and unselected
-        unselected_coords = []
-        selected_coords = []
-        
-        for vd in vertex_data:
-            coord = (vd["co"].x, vd["co"].y, vd["co"].z)
-            if vd["is_selected"]:
-                selected_coords.append(coord)
-            else:
-                unselected_coords.append(coord)
-        
-        # Draw unselected (gray)
-        if unselected_coords:
-            shader = gpu.shader.from_builtin("UNIFORM_COLOR")
-            batch = batch_for_shader(shader, "POINTS", {"pos": unselected_coords})
-            shader.bind()
-            shader.uniform_float("color", (0.5, 0.5, 0.5, 0.8))
-            gpu.state.point_size_set(6.0)
-            batch.draw(shader)
-        
-        # Draw selected (yellow)
-        if selected_coords:
-            shader = gpu.shader.from_builtin("UNIFORM_COLOR")
-            batch = batch_for_shader(shader, "POINTS", {"pos": selected_coords})
-            shader.bind()
-            shader.uniform_float("color", (1.0, 1.0, 0.0, 1.0))
-            gpu.state.point_size_set(8.0)
-            batch.draw(shader)
-        
-        gpu.state.point_size_set(1.0)
-    except:
-        pass
+    vertex_list = props.vertex_list
+    count = len(vertex_list)
+    values = {}
+    for attr, dtype in (("x", np.float32), ("y", np.float32), ("z", np.float32),
+                        ("distance", np.float32), ("index", np.int32)):
+        values[attr] = np.empty(count, dtype=dtype)
+        vertex_list.foreach_get(attr, values[attr])
+    coords = np.column_stack((values["x"], values["y"], values["z"]))
+    
+    # Largest offsets first, limited for display
+    order = np.argsort(-values["distance"], kind="stable")
+    if props.limit_display:
+        order = order[:props.max_display_vertices]
+    
+    selected = toolkit_common.ToolkitUtils.parse_vertex_indices(props.selected_vertices)
+    is_selected = np.isin(values["index"][order], np.fromiter(selected, dtype=np.int32, count=len(selected)))
+    unselected_layer.set_points(coords[order[~is_selected]])
+    selected_layer.set_points(coords[order[is_selected]])
 
 
 # ==================== MAIN PANEL ====================
@@ -260,10 +339,14 @@ class EMESH_PT_MainPanel(bpy.types.Panel):
 
 _last_active_object = None
 
-def scene_update_handler(scene):
-    """Monitor object selection changes for auto-shapekey selection"""
+@persistent
+def scene_update_handler(scene, depsgraph=None):
+    """Monitor object selection changes and invalidate cached scan data"""
     global _last_active_object
     
+    if depsgraph is not None:
+        toolkit_common.ToolkitCache.on_depsgraph_update(depsgraph)
+    
     context = bpy.context
     if not context:
         return
@@ -282,6 +365,18 @@ def scene_update_handler(scene):
                 pass
 
 
+@persistent
+def load_post_handler(*args):
+    """Drop cached scan data when a new file is loaded"""
+    toolkit_common.ToolkitCache.clear_all()
+
+
+@persistent
+def undo_redo_handler(*args):
+    """Drop cached data after undo/redo: cached object references are freed"""
+    toolkit_common.ToolkitCache.clear_all()
+
+
 # ==================== REGISTRATION ====================
 
 classes = (
@@ -291,11 +386,7 @@ classes = (
     EMESH_PT_MainPanel,
 )
 
-_draw_handler = None
-
 def register():
-    global _draw_handler
-    
     # Register common utilities
     toolkit_common.register()
     
@@ -306,53 +397,53 @@ def register():
     # Register properties
     bpy.types.Scene.emesh_toolkit = bpy.props.PointerProperty(type=EMESH_ToolkitProperties)
     
+    # Shapekey overlay layers, drawn below the module layers
+    toolkit_overlay.register_layer(
+        "shapekey", (0.5, 0.5, 0.5, 0.8), 6.0, toggle="overlay_shapekey", sync=sync_shapekey_overlay
+    )
+    toolkit_overlay.register_layer(
+        "shapekey_selected", (1.0, 1.0, 0.0, 1.0), 8.0, toggle="overlay_shapekey", sync=sync_shapekey_overlay
+    )
+    
     # Register modules
     mod_shapekeys.register()
     mod_weights.register()
     mod_rigging.register()
     mod_selection.register()
     
-    # Register shapekey overlay
-    _draw_handler = bpy.types.SpaceView3D.draw_handler_add(
-        draw_shapekey_overlay, (), "WINDOW", "POST_VIEW"
-    )
-    
-    # Register weight overlay from mod_weights
-    mod_weights._draw_handler = bpy.types.SpaceView3D.draw_handler_add(
-        mod_weights.draw_weight_overlay, (), "WINDOW", "POST_VIEW"
-    )
+    # Register the overlay manager (one draw handler for all layers)
+    toolkit_overlay.register()
     
     # Register scene update handler for object selection monitoring
     bpy.app.handlers.depsgraph_update_post.append(scene_update_handler)
+    bpy.app.handlers.load_post.append(load_post_handler)
+    bpy.app.handlers.undo_post.append(undo_redo_handler)
+    bpy.app.handlers.redo_post.append(undo_redo_handler)
     
     print("Emil's Mesh Toolkit (Modular) registered successfully")
 
 
 def unregister():
-    global _draw_handler
-    
     # Unregister scene update handler
     if scene_update_handler in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.remove(scene_update_handler)
+    if load_post_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(load_post_handler)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if undo_redo_handler in handlers:
+            handlers.remove(undo_redo_handler)
+    toolkit_common.ToolkitCache.clear_all()
     
-    # Unregister shapekey overlay
-    if _draw_handler:
-        bpy.types.SpaceView3D.draw_handler_remove(_draw_handler, "WINDOW")
-        _draw_handler = None
-    
-    # Unregister weight overlay
-    if hasattr(mod_weights, '_draw_handler') and mod_weights._draw_handler:
-        try:
-            bpy.types.SpaceView3D.draw_handler_remove(mod_weights._draw_handler, "WINDOW")
-        except:
-            pass
-        mod_weights._draw_handler = None
+    # Unregister the overlay manager
+    toolkit_overlay.unregister()
     
     # Unregister modules
     mod_selection.unregister()
     mod_rigging.unregister()
     mod_weights.unregister()
     mod_shapekeys.unregister()
+    toolkit_overlay.unregister_layer("shapekey_selected")
+    toolkit_overlay.unregister_layer("shapekey")
     
     # Unregister properties
     del bpy.types.Scene.emesh_toolkit
@@ -0,0 +1,207 @@
+"""
+Emil's Mesh Toolkit - Overlay Manager
+One viewport draw handler for every point overlay, with cached GPU batches
+"""
+
+import bpy
+import gpu
+import numpy as np
+from bpy.app.handlers import persistent
+from gpu_extras.batch import batch_for_shader
+
+
+# ==================== LAYERS ====================
+
+class OverlayLayer:
+    """Points drawn in one color, shown while a toolkit toggle property is on
+
+    Positions live in a float32 (n, 3) buffer; the GPU batch is rebuilt only when
+    the layer's version changes. A layer with a source reads it from that
+    EMESH_CoordItem collection (three foreach_get calls) whenever it is tagged or
+    the collection length changes. A layer with a sync callback is refreshed by
+    it before drawing instead. matrix, if set, is applied as the model matrix.
+    """
+    __slots__ = (
+        "name", "color", "point_size", "toggle", "source", "sync",
+        "positions", "matrix", "version", "stale", "_batch", "_batch_version",
+    )
+    
+    def __init__(self, name, color, point_size=8.0, toggle="", source=None, sync=None):
+        self.name = name
+        self.color = color
+        self.point_size = point_size
+        self.toggle = toggle
+        self.source = source
+        self.sync = sync
+        self.positions = np.zeros((0, 3), dtype=np.float32)
+        self.matrix = None
+        self.version = 0
+        self.stale = True
+        self._batch = None
+        self._batch_version = -1
+    
+    def set_points(self, positions):
+        """Replace the layer's positions"""
+        self.positions = np.ascontiguousarray(positions, dtype=np.float32).reshape(-1, 3)
+        self.version += 1
+        self.stale = False
+    
+    def load_collection(self, collection):
+        """Read positions from an EMESH_CoordItem collection in bulk"""
+        positions = np.empty((len(collection), 3), dtype=np.float32)
+        for axis, attr in enumerate("xyz"):
+            values = np.empty(len(collection), dtype=np.float32)
+            collection.foreach_get(attr, values)
+            positions[:, axis] = values
+        self.set_points(positions)
+    
+    def get_batch(self, shader):
+        """GPU batch for the current positions, or None when empty"""
+        if self._batch_version != self.version:
+            self._batch = None
+            if len(self.positions):
+                self._batch = batch_for_shader(shader, "POINTS", {"pos": self.positions})
+            self._batch_version = self.version
+        return self._batch
+    
+    def release(self):
+        """Drop the GPU batch"""
+        self._batch = None
+        self._batch_version = -1
+
+
+_layers = {}
+
+
+def register_layer(name, color, point_size=8.0, toggle="", source=None, sync=None):
+    """Add a layer (drawn in registration order) and return it"""
+    layer = OverlayLayer(name, color, point_size, toggle, source, sync)
+    _layers[name] = layer
+    return layer
+
+
+def unregister_layer(name):
+    """Remove a layer and its GPU batch"""
+    layer = _layers.pop(name, None)
+    _failed_layers.discard(name)
+    if layer:
+        layer.release()
+
+
+def get_layer(name):
+    """Registered layer by name, or None"""
+    return _layers.get(name)
+
+
+def tag_layer(name):
+    """Mark a source layer for reloading after its collection was rewritten"""
+    layer = _layers.get(name)
+    if layer:
+        layer.stale = True
+
+
+def tag_all_layers():
+    """Mark every layer for reloading"""
+    for layer in _layers.values():
+        layer.stale = True
+
+
+# ==================== DRAWING ====================
+
+# Layers whose draw error has already been reported
+_failed_layers = set()
+
+
+def draw_batch(shader, batch, layer):
+    """Draw one layer's batch in its color and point size"""
+    shader.bind()
+    shader.uniform_float("color", layer.color)
+    gpu.state.point_size_set(layer.point_size)
+    batch.draw(shader)
+
+
+def draw_overlays():
+    """Draw every enabled layer; no per-point Python work unless a layer changed"""
+    context = bpy.context
+    props = getattr(context.scene, "emesh_toolkit", None)
+    if props is None:
+        return
+    
+    shader = gpu.shader.from_builtin("UNIFORM_COLOR")
+    for layer in _layers.values():
+        if layer.toggle and not getattr(props, layer.toggle):
+            continue
+        
+        try:
+            if layer.sync:
+                layer.sync(context, layer)
+            elif layer.source:
+                collection = getattr(props, layer.source)
+                if layer.stale or len(collection) != len(layer.positions):
+                    layer.load_collection(collection)
+            
+            batch = layer.get_batch(shader)
+            if batch is None:
+                continue
+            
+            if layer.matrix is not None:
+                gpu.matrix.push()
+                try:
+                    gpu.matrix.multiply_matrix(layer.matrix)
+                    draw_batch(shader, batch, layer)
+                finally:
+                    gpu.matrix.pop()
+            else:
+                draw_batch(shader, batch, layer)
+        except Exception as e:
+            # Drawing runs on every redraw; report each failing layer only once
+            if layer.name not in _failed_layers:
+                _failed_layers.add(layer.name)
+                print(f"Overlay '{layer.name}' failed to draw: {e}")
+    
+    gpu.state.point_size_set(1.0)
+
+
+@persistent
+def undo_redo_handler(*args):
+    """Collections may have changed under undo/redo or file load"""
+    tag_all_layers()
+
+
+# ==================== REGISTRATION ====================
+
+_draw_handler = None
+
+_state_handlers = (
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+    bpy.app.handlers.load_post,
+)
+
+
+def register():
+    global _draw_handler
+    
+    _draw_handler = bpy.types.SpaceView3D.draw_handler_add(
+        draw_overlays, (), "WINDOW", "POST_VIEW"
+    )
+    for handlers in _state_handlers:
+        handlers.append(undo_redo_handler)
+
+
+def unregister():
+    global _draw_handler
+    
+    for handlers in _state_handlers:
+        if undo_redo_handler in handlers:
+            handlers.remove(undo_redo_handler)
+    
+    if _draw_handler:
+        try:
+            bpy.types.SpaceView3D.draw_handler_remove(_draw_handler, "WINDOW")
+        except:
+            pass
+        _draw_handler = None
+    
+    for layer in _layers.values():
+        layer.release()